@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Faculty, Student
+from .models import User, Faculty, Student, FacultyStats
 
 
 @admin.register(User)
@@ -38,4 +38,11 @@ class StudentAdmin(admin.ModelAdmin):
     list_display = ('usn', 'full_name', 'department', 'semester', 'user')
     list_filter = ('department', 'semester')
     search_fields = ('usn', 'full_name', 'department')
-    ordering = ('-created_at',)
\ No newline at end of file
+    ordering = ('-created_at',)
+
+
+@admin.register(FacultyStats)
+class FacultyStatsAdmin(admin.ModelAdmin):
+    list_display = ('faculty', 'total_teams', 'submitted_projects', 'evaluated_projects', 'updated_at')
+    search_fields = ('faculty__full_name', 'faculty__faculty_id')
+    readonly_fields = ('updated_at',)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import Faculty, FacultyStats
+
+
+class Command(BaseCommand):
+    help = 'Recount the dashboard statistics of every faculty'
+
+    def handle(self, *args, **options):
+        count = 0
+        for faculty_id in Faculty.objects.values_list('id', flat=True):
+            FacultyStats.rebuild(faculty_id)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {count} faculty.'))
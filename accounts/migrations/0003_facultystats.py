@@ -0,0 +1,27 @@
+# Generated by Django 3.2.25 on 2026-10-17 02:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_auto_20251121_0806'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacultyStats',
+            fields=[
+                ('faculty', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='accounts.faculty')),
+                ('total_teams', models.IntegerField(default=0)),
+                ('submitted_projects', models.IntegerField(default=0)),
+                ('evaluated_projects', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Faculty Stats',
+            },
+        ),
+    ]
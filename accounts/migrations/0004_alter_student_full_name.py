@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-17 03:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_facultystats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='student',
+            name='full_name',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-17 03:24
+
+from django.db import migrations, models
+
+
+def fill_search_name(apps, schema_editor):
+    Student = apps.get_model('accounts', 'Student')
+    for student in Student.objects.only('id', 'full_name'):
+        Student.objects.filter(id=student.id).update(search_name=(student.full_name or '').strip().lower())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_student_full_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='search_name',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='full_name',
+            field=models.CharField(max_length=200),
+        ),
+        migrations.RunPython(fill_search_name, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-17 09:12
+
+from django.db import migrations
+
+
+def uppercase_usn(apps, schema_editor):
+    Student = apps.get_model('accounts', 'Student')
+    existing = set(Student.objects.values_list('usn', flat=True))
+    for student in Student.objects.only('id', 'usn'):
+        usn = (student.usn or '').strip().upper()
+        if usn == student.usn or usn in existing:
+            # Already normalized, or a duplicate that has to be merged by hand
+            continue
+        Student.objects.filter(id=student.id).update(usn=usn)
+        existing.add(usn)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_student_search_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(uppercase_usn, migrations.RunPython.noop),
+    ]
@@ -70,6 +70,8 @@ class Student(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='student_profile')
     usn = models.CharField(max_length=20, unique=True, verbose_name='USN')
     full_name = models.CharField(max_length=200)
+    # Lower-cased full_name, so case-insensitive prefix search can use a plain index
+    search_name = models.CharField(max_length=200, db_index=True, blank=True, editable=False)
     department = models.CharField(max_length=100)
     semester = models.IntegerField()
     phone = models.CharField(max_length=15)
@@ -77,4 +79,55 @@ class Student(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.full_name} ({self.usn})"
\ No newline at end of file
+        return f"{self.full_name} ({self.usn})"
+
+    def save(self, *args, **kwargs):
+        # USNs are stored upper-case, which student search and team lookups rely on
+        self.usn = (self.usn or '').strip().upper()
+        self.search_name = (self.full_name or '').strip().lower()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'full_name' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'search_name'}
+        super().save(*args, **kwargs)
+
+
+class FacultyStats(models.Model):
+    """Dashboard counters for a faculty, adjusted by accounts.signals as teams, projects and evaluations change"""
+    faculty = models.OneToOneField(Faculty, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    total_teams = models.IntegerField(default=0)
+    submitted_projects = models.IntegerField(default=0)
+    evaluated_projects = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'Faculty Stats'
+
+    def __str__(self):
+        return f"Stats - {self.faculty.full_name}"
+
+    @staticmethod
+    def compute(faculty_id):
+        """Count teams, submitted projects and fully evaluated projects"""
+        from projects.models import ProjectTeam, Project
+        from evaluations.models import ProjectEvaluation
+
+        return {
+            'total_teams': ProjectTeam.objects.filter(faculty_id=faculty_id).count(),
+            'submitted_projects': Project.objects.filter(team__faculty_id=faculty_id).count(),
+            'evaluated_projects': ProjectEvaluation.objects.filter(faculty_id=faculty_id,
+                                                                   ai_marks__isnull=False,
+                                                                   faculty_marks__isnull=False).count(),
+        }
+
+    @classmethod
+    def adjust(cls, faculty_id, **deltas):
+        """Add deltas to the counters of an existing stats row with F(), without recounting"""
+        changes = {field: models.F(field) + delta for field, delta in deltas.items() if delta}
+        if faculty_id is not None and changes:
+            cls.objects.filter(faculty_id=faculty_id).update(updated_at=timezone.now(), **changes)
+
+    @classmethod
+    def rebuild(cls, faculty_id):
+        """Recount and create the stats row if it is missing"""
+        stats, created = cls.objects.update_or_create(faculty_id=faculty_id, defaults=cls.compute(faculty_id))
+        return stats
@@ -0,0 +1,110 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from .models import Faculty, FacultyStats
+from projects.models import ProjectTeam, Project
+from evaluations.models import ProjectEvaluation
+
+
+# Counters move by one on the state changes that affect them; only rebuild() recounts.
+# post_init remembers the state an instance was loaded with, so a save can tell what changed.
+
+EVALUATION_STATE_FIELDS = ('faculty_id', 'ai_marks', 'faculty_marks')
+
+
+@receiver(post_save, sender=Faculty)
+def create_faculty_stats(sender, instance, created, **kwargs):
+    if created:
+        FacultyStats.objects.get_or_create(faculty=instance)
+
+
+def _team_faculty_id(team_id):
+    # Looked up by id - the team may already be gone in a cascade delete
+    return ProjectTeam.objects.filter(id=team_id).values_list('faculty_id', flat=True).first()
+
+
+@receiver(post_init, sender=ProjectTeam)
+def remember_team_faculty(sender, instance, **kwargs):
+    if 'faculty_id' not in instance.get_deferred_fields():
+        instance._stats_faculty_id = instance.faculty_id
+
+
+@receiver(post_save, sender=ProjectTeam)
+def count_team(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_stats_faculty_id', None)
+    if created:
+        FacultyStats.adjust(instance.faculty_id, total_teams=1)
+    elif previous != instance.faculty_id:
+        # Team moved to another faculty (or loaded without faculty) - rare, so recount both
+        for faculty_id in {previous, instance.faculty_id} - {None}:
+            FacultyStats.rebuild(faculty_id)
+    instance._stats_faculty_id = instance.faculty_id
+
+
+@receiver(post_delete, sender=ProjectTeam)
+def uncount_team(sender, instance, **kwargs):
+    FacultyStats.adjust(instance.faculty_id, total_teams=-1)
+
+
+@receiver(post_save, sender=Project)
+def count_project(sender, instance, created, **kwargs):
+    if created:
+        FacultyStats.adjust(_team_faculty_id(instance.team_id), submitted_projects=1)
+
+
+@receiver(post_delete, sender=Project)
+def uncount_project(sender, instance, **kwargs):
+    FacultyStats.adjust(_team_faculty_id(instance.team_id), submitted_projects=-1)
+
+
+def _counted_for(values):
+    """Faculty whose evaluated_projects an evaluation with these values counts towards, or None"""
+    if values['ai_marks'] is not None and values['faculty_marks'] is not None:
+        return values['faculty_id']
+    return None
+
+
+def _evaluation_values(instance):
+    return {field: getattr(instance, field) for field in EVALUATION_STATE_FIELDS}
+
+
+@receiver(post_init, sender=ProjectEvaluation)
+def remember_evaluation_state(sender, instance, **kwargs):
+    if set(EVALUATION_STATE_FIELDS) & instance.get_deferred_fields():
+        instance._stats_values = None
+    else:
+        instance._stats_values = _evaluation_values(instance)
+
+
+@receiver(post_save, sender=ProjectEvaluation)
+def count_evaluation(sender, instance, created, update_fields=None, **kwargs):
+    loaded = getattr(instance, '_stats_values', None)
+    current = _evaluation_values(instance)
+
+    if created:
+        before, after = None, _counted_for(current)
+    elif loaded is None:
+        FacultyStats.rebuild(instance.faculty_id)
+        instance._stats_values = current
+        return
+    elif update_fields is None:
+        before, after = _counted_for(loaded), _counted_for(current)
+    else:
+        written = {f for f in EVALUATION_STATE_FIELDS if f in update_fields or f.replace('_id', '') in update_fields}
+        if not written:
+            return
+        # Columns outside update_fields may have been changed by another process (AI and
+        # faculty marks are saved separately), so read back the saved row
+        saved = ProjectEvaluation.objects.filter(pk=instance.pk).values(*EVALUATION_STATE_FIELDS).first() or current
+        before = _counted_for({f: loaded[f] if f in written else saved[f] for f in EVALUATION_STATE_FIELDS})
+        after = _counted_for(saved)
+        current = saved
+
+    if before != after:
+        FacultyStats.adjust(before, evaluated_projects=-1)
+        FacultyStats.adjust(after, evaluated_projects=1)
+    instance._stats_values = current
+
+
+@receiver(post_delete, sender=ProjectEvaluation)
+def uncount_evaluation(sender, instance, **kwargs):
+    FacultyStats.adjust(_counted_for(_evaluation_values(instance)), evaluated_projects=-1)
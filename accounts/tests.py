@@ -1,3 +1,232 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from .models import User, Faculty, Student, FacultyStats
+from projects.models import ProjectTeam, TeamMember, Project
+from evaluations.models import ProjectEvaluation
 
-# Create your tests here.
+
+class FacultyDashboardQueryTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email='faculty@example.com', password='pass1234', user_type='faculty')
+        self.faculty = Faculty.objects.create(
+            user=user, faculty_id='FAC001', full_name='Test Faculty',
+            department='CSE', phone='9999999999', designation='Professor'
+        )
+        self.student_count = 0
+        self.client.login(email='faculty@example.com', password='pass1234')
+
+    def add_teams(self, count):
+        for _ in range(count):
+            team = ProjectTeam.objects.create(team_name=f'Team {self.student_count}', faculty=self.faculty)
+            for is_leader in (True, False):
+                self.student_count += 1
+                user = User.objects.create_user(
+                    email=f'student{self.student_count}@example.com', password='pass1234', user_type='student'
+                )
+                student = Student.objects.create(
+                    user=user, usn=f'USN{self.student_count:04d}', full_name=f'Student {self.student_count}',
+                    department='CSE', semester=7, phone='8888888888'
+                )
+                TeamMember.objects.create(team=team, student=student, is_leader=is_leader)
+                if is_leader:
+                    team.leader = student
+                    team.save()
+            Project.objects.create(
+                team=team, project_name=f'Project {team.team_name}',
+                github_link='https://github.com/example/project', status='submitted'
+            )
+
+    def count_dashboard_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('faculty_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries)
+
+    def test_query_count_does_not_grow_with_teams(self):
+        self.add_teams(2)
+        baseline = self.count_dashboard_queries()
+
+        self.add_teams(8)
+        self.assertEqual(self.count_dashboard_queries(), baseline)
+
+    def test_member_count_is_annotated(self):
+        self.add_teams(1)
+        response = self.client.get(reverse('faculty_dashboard'))
+        self.assertContains(response, '2 / 4')
+
+
+class StudentResultsQueryTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email='faculty@example.com', password='pass1234', user_type='faculty')
+        self.faculty = Faculty.objects.create(
+            user=user, faculty_id='FAC001', full_name='Test Faculty',
+            department='CSE', phone='9999999999', designation='Professor'
+        )
+        user = User.objects.create_user(email='student@example.com', password='pass1234', user_type='student')
+        self.student = Student.objects.create(
+            user=user, usn='USN0001', full_name='Test Student',
+            department='CSE', semester=7, phone='8888888888'
+        )
+        self.team_count = 0
+        self.client.login(email='student@example.com', password='pass1234')
+
+    def add_evaluated_teams(self, count):
+        for _ in range(count):
+            self.team_count += 1
+            team = ProjectTeam.objects.create(team_name=f'Team {self.team_count}', faculty=self.faculty)
+            TeamMember.objects.create(team=team, student=self.student)
+            project = Project.objects.create(
+                team=team, project_name=f'Project {self.team_count}',
+                github_link='https://github.com/example/project', status='evaluated'
+            )
+            ProjectEvaluation.objects.create(
+                project=project, faculty=self.faculty, evaluation_criteria='[]',
+                ai_marks=70.0, faculty_marks=80.0
+            )
+
+    def count_queries(self, url_name):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries)
+
+    def test_results_query_count_does_not_grow_with_teams(self):
+        self.add_evaluated_teams(1)
+        baseline = self.count_queries('student_results')
+
+        self.add_evaluated_teams(4)
+        self.assertEqual(self.count_queries('student_results'), baseline)
+
+    def test_results_only_lists_fully_evaluated_projects(self):
+        self.add_evaluated_teams(2)
+        ProjectEvaluation.objects.filter(project__project_name='Project 2').update(faculty_marks=None)
+
+        response = self.client.get(reverse('student_results'))
+        self.assertEqual([r['project'].project_name for r in response.context['results']], ['Project 1'])
+
+    def test_dashboard_query_count_does_not_grow_with_teams(self):
+        self.add_evaluated_teams(1)
+        baseline = self.count_queries('student_dashboard')
+
+        self.add_evaluated_teams(4)
+        team = ProjectTeam.objects.create(team_name='No Project Yet', faculty=self.faculty)
+        TeamMember.objects.create(team=team, student=self.student)
+        self.assertEqual(self.count_queries('student_dashboard'), baseline)
+
+    def test_renamed_project_is_not_served_from_cache(self):
+        self.add_evaluated_teams(1)
+        self.client.get(reverse('student_results'))
+
+        Project.objects.filter(project_name='Project 1').update(project_name='Renamed Project')
+        response = self.client.get(reverse('student_results'))
+        self.assertContains(response, 'Renamed Project')
+
+
+class FacultyStatsTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email='faculty@example.com', password='pass1234', user_type='faculty')
+        self.faculty = Faculty.objects.create(
+            user=user, faculty_id='FAC001', full_name='Test Faculty',
+            department='CSE', phone='9999999999', designation='Professor'
+        )
+
+    def counters(self):
+        stats = FacultyStats.objects.get(pk=self.faculty.pk)
+        return {
+            'total_teams': stats.total_teams,
+            'submitted_projects': stats.submitted_projects,
+            'evaluated_projects': stats.evaluated_projects,
+        }
+
+    def assertCounters(self, total_teams, submitted_projects, evaluated_projects):
+        expected = {
+            'total_teams': total_teams,
+            'submitted_projects': submitted_projects,
+            'evaluated_projects': evaluated_projects,
+        }
+        self.assertEqual(self.counters(), expected)
+        self.assertEqual(FacultyStats.compute(self.faculty.pk), expected)
+
+    def add_project(self, name):
+        team = ProjectTeam.objects.create(team_name=name, faculty=self.faculty)
+        project = Project.objects.create(
+            team=team, project_name=name, github_link='https://github.com/example/project', status='submitted'
+        )
+        evaluation = ProjectEvaluation.objects.create(project=project, faculty=self.faculty, evaluation_criteria='[]')
+        return team, evaluation
+
+    def test_counters_follow_changes(self):
+        team, evaluation = self.add_project('Team 1')
+        self.add_project('Team 2')
+        self.assertCounters(2, 2, 0)
+
+        evaluation.ai_marks = 70.0
+        evaluation.faculty_marks = 80.0
+        evaluation.save()
+        self.assertCounters(2, 2, 1)
+
+        evaluation.save()
+        self.assertCounters(2, 2, 1)
+
+        evaluation.faculty_marks = None
+        evaluation.save(update_fields=['faculty_marks'])
+        self.assertCounters(2, 2, 0)
+
+        evaluation.faculty_marks = 75.0
+        evaluation.save(update_fields=['faculty_marks'])
+        team.delete()
+        self.assertCounters(1, 1, 0)
+
+    def test_ai_and_faculty_marks_saved_by_separate_instances(self):
+        self.add_project('Team 1')
+        ai_copy = ProjectEvaluation.objects.get()
+        faculty_copy = ProjectEvaluation.objects.get()
+
+        ai_copy.ai_marks = 70.0
+        ai_copy.save(update_fields=['ai_marks'])
+        faculty_copy.faculty_marks = 80.0
+        faculty_copy.save(update_fields=['faculty_marks'])
+        self.assertCounters(1, 1, 1)
+
+    def test_saves_do_not_recount(self):
+        team, evaluation = self.add_project('Team 1')
+        evaluation.ai_marks = 70.0
+
+        with CaptureQueriesContext(connection) as queries:
+            evaluation.save(update_fields=['ai_marks'])
+            team.save()
+        self.assertFalse([q for q in queries.captured_queries if 'COUNT(' in q['sql'].upper()])
+
+    def test_updated_at_changes(self):
+        before = FacultyStats.objects.get(pk=self.faculty.pk).updated_at
+        self.add_project('Team 1')
+        self.assertGreater(FacultyStats.objects.get(pk=self.faculty.pk).updated_at, before)
+
+
+class StudentUSNTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email='faculty@example.com', password='pass1234', user_type='faculty')
+        self.faculty = Faculty.objects.create(
+            user=user, faculty_id='FAC001', full_name='Test Faculty',
+            department='CSE', phone='9999999999', designation='Professor'
+        )
+        self.team = ProjectTeam.objects.create(team_name='Team 1', faculty=self.faculty)
+
+    def register(self, usn):
+        return self.client.post(reverse('student_register'), {
+            'email': f'{usn.strip().lower()}@example.com', 'password': 'pass1234', 'confirm_password': 'pass1234',
+            'usn': usn, 'full_name': 'Test Student', 'department': 'CSE', 'semester': '7', 'phone': '8888888888',
+        })
+
+    def test_usn_is_stored_upper_case_and_found_by_search(self):
+        self.register(' 1ab21cs001 ')
+        self.assertEqual(Student.objects.get().usn, '1AB21CS001')
+
+        self.register('1AB21CS001')
+        self.assertEqual(Student.objects.count(), 1)
+
+        self.client.login(email='faculty@example.com', password='pass1234')
+        response = self.client.get(reverse('search_students', args=[self.team.id]), {'q': '1ab21'})
+        self.assertEqual([s['usn'] for s in response.json()['results']], ['1AB21CS001'])
@@ -3,7 +3,8 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db import transaction
-from .models import User, Faculty, Student
+from django.db.models import Count
+from .models import User, Faculty, Student, FacultyStats
 from projects.models import ProjectTeam, TeamMember, Project
 from evaluations.models import ProjectEvaluation
 
@@ -120,21 +121,27 @@ def faculty_dashboard(request):
         return redirect('dashboard')
 
     faculty = request.user.faculty_profile
-    teams = ProjectTeam.objects.filter(faculty=faculty).order_by('-created_at')
 
-    # Get projects statistics
-    total_teams = teams.count()
-    submitted_projects = Project.objects.filter(team__faculty=faculty).count()
-    evaluated_projects = ProjectEvaluation.objects.filter(faculty=faculty,
-                                                          ai_marks__isnull=False,
-                                                          faculty_marks__isnull=False).count()
+    # One query for the whole table: leader and project joined, members counted
+    teams = list(
+        ProjectTeam.objects.filter(faculty=faculty)
+        .select_related('leader', 'project')
+        .annotate(member_count=Count('members'))
+        .order_by('-created_at')
+    )
+
+    # Get projects statistics (maintained on write, see accounts.signals)
+    try:
+        stats = FacultyStats.objects.get(pk=faculty.pk)
+    except FacultyStats.DoesNotExist:
+        stats = FacultyStats.rebuild(faculty.pk)
 
     context = {
         'faculty': faculty,
         'teams': teams,
-        'total_teams': total_teams,
-        'submitted_projects': submitted_projects,
-        'evaluated_projects': evaluated_projects,
+        'total_teams': stats.total_teams,
+        'submitted_projects': stats.submitted_projects,
+        'evaluated_projects': stats.evaluated_projects,
     }
 
     return render(request, 'accounts/faculty_dashboard.html', context)
@@ -174,7 +181,7 @@ def student_register(request):
         email = request.POST.get('email')
         password = request.POST.get('password')
         confirm_password = request.POST.get('confirm_password')
-        usn = request.POST.get('usn')
+        usn = (request.POST.get('usn') or '').strip().upper()
         full_name = request.POST.get('full_name')
         department = request.POST.get('department')
         semester = request.POST.get('semester')
@@ -230,12 +237,20 @@ def student_dashboard(request):
 
     student = request.user.student_profile
 
-    # Get student's teams
-    team_memberships = TeamMember.objects.filter(student=student).select_related('team')
+    # Get student's teams, with faculty, leader and project joined in
+    team_memberships = list(
+        TeamMember.objects.filter(student=student)
+        .select_related('team', 'team__faculty', 'team__leader', 'team__project')
+    )
     teams = [membership.team for membership in team_memberships]
 
     # Get projects where student is a member
-    projects = Project.objects.filter(team__in=teams)
+    projects = []
+    for team in teams:
+        try:
+            projects.append(team.project)
+        except Project.DoesNotExist:
+            continue
 
     context = {
         'student': student,
@@ -278,26 +293,19 @@ def student_results(request):
 
     student = request.user.student_profile
 
-    # Get all teams student is part of
-    team_memberships = TeamMember.objects.filter(student=student).select_related('team')
-    teams = [membership.team for membership in team_memberships]
-
-    # Get evaluated projects
-    results = []
-    for team in teams:
-        try:
-            project = team.project
-            if hasattr(project, 'evaluation'):
-                evaluation = project.evaluation
-                if evaluation.is_fully_evaluated:
-                    results.append({
-                        'team': team,
-                        'project': project,
-                        'evaluation': evaluation,
-                        'student': student,
-                    })
-        except Project.DoesNotExist:
-            continue
+    # Get fully evaluated projects of every team the student is part of
+    evaluations = ProjectEvaluation.objects.filter(
+        project__team__members__student=student,
+        ai_marks__isnull=False,
+        faculty_marks__isnull=False
+    ).select_related('project', 'project__team', 'project__team__faculty')
+
+    results = [{
+        'team': evaluation.project.team,
+        'project': evaluation.project,
+        'evaluation': evaluation,
+        'student': student,
+    } for evaluation in evaluations]
 
     context = {
         'student': student,
@@ -21,6 +21,9 @@ ALLOWED_HOSTS = [
     '.onrender.com',
 ]
 
+# Public address of the site, used for links in emails
+SITE_URL = config('SITE_URL', default='http://localhost:8000')
+
 # Application definition
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -32,6 +35,7 @@ INSTALLED_APPS = [
     'accounts',
     'projects',
     'evaluations',
+    'notifications',
 ]
 
 MIDDLEWARE = [
@@ -118,7 +122,10 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Email Configuration (SMTP)
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# All mail goes through the outbox; EMAIL_OUTBOX_DELIVERY_BACKEND is what actually sends it
+# (use django.core.mail.backends.console.EmailBackend to print mail locally)
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='notifications.backends.QueuedEmailBackend')
+EMAIL_OUTBOX_DELIVERY_BACKEND = config('EMAIL_OUTBOX_DELIVERY_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
 EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
 EMAIL_USE_TLS = True
@@ -126,9 +133,95 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default=EMAIL_HOST_USER)
 
+# Outbox - mail is queued in the database and sent by `manage.py send_queued_emails`
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=50, cast=int)  # emails per SMTP connection
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_OUTBOX_RETRY_DELAY = config('EMAIL_OUTBOX_RETRY_DELAY', default=60, cast=int)  # seconds, doubled per attempt
+EMAIL_OUTBOX_MAX_RETRY_DELAY = config('EMAIL_OUTBOX_MAX_RETRY_DELAY', default=3600, cast=int)
+
 # Gemini AI Configuration
 GEMINI_API_KEY = config('GEMINI_API_KEY', default='')
 
+# AI evaluator backend - use 'evaluations.backends.FakeBackend' to load-test offline
+EVALUATOR_BACKEND = config('EVALUATOR_BACKEND', default='evaluations.backends.GeminiBackend')
+EVALUATOR_FAKE_LATENCY = config('EVALUATOR_FAKE_LATENCY', default=15.0, cast=float)  # seconds
+EVALUATOR_FAKE_LATENCY_JITTER = config('EVALUATOR_FAKE_LATENCY_JITTER', default=5.0, cast=float)
+EVALUATOR_FAKE_FAILURE_RATE = config('EVALUATOR_FAKE_FAILURE_RATE', default=0.0, cast=float)
+
+# Seconds between heartbeats of a running evaluation job; keep well below the worker's --stale-after
+EVALUATION_JOB_HEARTBEAT = config('EVALUATION_JOB_HEARTBEAT', default=60, cast=int)
+
+# Evaluator calls from every process on the host share one token bucket (0 per minute = unlimited)
+EVALUATOR_RATE_LIMIT_PER_MINUTE = config('EVALUATOR_RATE_LIMIT_PER_MINUTE', default=15, cast=int)
+EVALUATOR_RATE_LIMIT_BURST = config('EVALUATOR_RATE_LIMIT_BURST', default=3, cast=int)
+EVALUATOR_RATE_LIMIT_TIMEOUT = config('EVALUATOR_RATE_LIMIT_TIMEOUT', default=300, cast=int)  # seconds to wait for a slot
+EVALUATOR_RATE_LIMIT_FILE = config('EVALUATOR_RATE_LIMIT_FILE', default=os.path.join(BASE_DIR, 'cache', 'evaluator_ratelimit.json'))
+
+# Retries of 429s and temporary outages: exponential backoff with jitter, and a retry budget
+# earning EVALUATOR_RETRY_BUDGET_RATIO retries per call (up to the max) shared by all processes
+EVALUATOR_MAX_RETRIES = config('EVALUATOR_MAX_RETRIES', default=4, cast=int)
+EVALUATOR_RETRY_BASE_DELAY = config('EVALUATOR_RETRY_BASE_DELAY', default=2.0, cast=float)  # seconds
+EVALUATOR_RETRY_MAX_DELAY = config('EVALUATOR_RETRY_MAX_DELAY', default=60.0, cast=float)
+EVALUATOR_RETRY_BUDGET_RATIO = config('EVALUATOR_RETRY_BUDGET_RATIO', default=0.2, cast=float)
+EVALUATOR_RETRY_BUDGET_MAX = config('EVALUATOR_RETRY_BUDGET_MAX', default=10, cast=int)
+
+# Circuit breaker: after this many consecutive transient failures (0 = off) evaluator calls fail
+# at once and queued jobs wait, until a single probe call is let through after the cooldown
+EVALUATOR_BREAKER_THRESHOLD = config('EVALUATOR_BREAKER_THRESHOLD', default=5, cast=int)
+EVALUATOR_BREAKER_COOLDOWN = config('EVALUATOR_BREAKER_COOLDOWN', default=60, cast=int)  # seconds
+EVALUATOR_BREAKER_FILE = config('EVALUATOR_BREAKER_FILE', default=os.path.join(BASE_DIR, 'cache', 'evaluator_breaker.json'))
+
+# Characters of report text extracted and stored per report; PDF pages past this are not parsed
+EVALUATION_REPORT_CHAR_BUDGET = config('EVALUATION_REPORT_CHAR_BUDGET', default=60000, cast=int)
+
+# Estimated tokens of report text packed into the evaluator prompt, chosen by relevance to the criteria
+EVALUATION_PROMPT_TOKEN_BUDGET = config('EVALUATION_PROMPT_TOKEN_BUDGET', default=3000, cast=int)
+
+# PDF extraction runs in separate processes, at most this many at once (0 processes = run inline)
+PDF_EXTRACTION_PROCESSES = config('PDF_EXTRACTION_PROCESSES', default=2, cast=int)
+PDF_EXTRACTION_TIMEOUT = config('PDF_EXTRACTION_TIMEOUT', default=30, cast=int)  # seconds per document
+PDF_EXTRACTION_MEMORY_LIMIT_MB = config('PDF_EXTRACTION_MEMORY_LIMIT_MB', default=1024, cast=int)  # address space per process
+
+# Long-report mode: reports estimated above this many tokens are summarized in parallel chunks
+# first, then scored from the summaries (0 = off). Raise EVALUATION_REPORT_CHAR_BUDGET with it
+# so whole reports are extracted.
+EVALUATION_LONG_REPORT_TOKENS = config('EVALUATION_LONG_REPORT_TOKENS', default=0, cast=int)
+EVALUATION_SUMMARY_CHUNK_TOKENS = config('EVALUATION_SUMMARY_CHUNK_TOKENS', default=4000, cast=int)
+EVALUATION_SUMMARY_CONCURRENCY = config('EVALUATION_SUMMARY_CONCURRENCY', default=4, cast=int)  # parallel summary calls
+EVALUATION_SUMMARY_WORDS = config('EVALUATION_SUMMARY_WORDS', default=200, cast=int)
+
+# Batched prompts: up to this many projects of one faculty are scored in a single evaluator call
+# by the worker and evaluate_pending (1 = off), each with its own report token budget
+EVALUATION_BATCH_PROMPT_SIZE = config('EVALUATION_BATCH_PROMPT_SIZE', default=1, cast=int)
+EVALUATION_BATCH_PROJECT_TOKEN_BUDGET = config('EVALUATION_BATCH_PROJECT_TOKEN_BUDGET', default=1500, cast=int)
+
+# Number of projects `manage.py evaluate_pending` evaluates in parallel
+EVALUATION_BATCH_CONCURRENCY = config('EVALUATION_BATCH_CONCURRENCY', default=4, cast=int)
+
+# Caches - Gemini responses live on disk so web, worker and batch processes share them
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'llm_responses': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('LLM_CACHE_DIR', default=os.path.join(BASE_DIR, 'cache', 'llm_responses')),
+        'TIMEOUT': config('LLM_CACHE_TTL', default=7 * 24 * 3600, cast=int),  # 7 days
+        'OPTIONS': {
+            'MAX_ENTRIES': config('LLM_CACHE_MAX_ENTRIES', default=1000, cast=int),
+        },
+    },
+    # Rendered evaluation result fragments, keyed by evaluation id and updated_at
+    'results': {
+        'BACKEND': config('RESULTS_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('RESULTS_CACHE_LOCATION', default='evaluation-results'),
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': config('RESULTS_CACHE_MAX_ENTRIES', default=2000, cast=int),
+        },
+    },
+}
+
 # Login URLs
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import EvaluationCriteria, ProjectEvaluation
+from .models import EvaluationCriteria, ProjectEvaluation, CriterionScore, EvaluationJob
 
 @admin.register(EvaluationCriteria)
 class EvaluationCriteriaAdmin(admin.ModelAdmin):
@@ -8,10 +8,29 @@ class EvaluationCriteriaAdmin(admin.ModelAdmin):
     search_fields = ('criteria_name', 'faculty__full_name')
     ordering = ('-created_at',)
 
+class CriterionScoreInline(admin.TabularInline):
+    model = CriterionScore
+    extra = 0
+    readonly_fields = ('updated_at',)
+
 @admin.register(ProjectEvaluation)
 class ProjectEvaluationAdmin(admin.ModelAdmin):
     list_display = ('project', 'faculty', 'ai_marks', 'faculty_marks', 'created_at')
     list_filter = ('faculty', 'created_at')
     search_fields = ('project__project_name', 'faculty__full_name')
     ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at')
\ No newline at end of file
+    readonly_fields = ('created_at', 'updated_at')
+    inlines = (CriterionScoreInline,)
+
+@admin.register(CriterionScore)
+class CriterionScoreAdmin(admin.ModelAdmin):
+    list_display = ('criteria_name', 'evaluation', 'ai_score', 'faculty_score', 'max_marks')
+    search_fields = ('criteria_name', 'evaluation__project__project_name')
+
+@admin.register(EvaluationJob)
+class EvaluationJobAdmin(admin.ModelAdmin):
+    list_display = ('project', 'faculty', 'status', 'created_at', 'finished_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('project__project_name', 'faculty__full_name')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'started_at', 'heartbeat_at', 'finished_at', 'stats')
@@ -0,0 +1,135 @@
+from django.db.models import Avg, Count, Max
+from .models import ProjectEvaluation, CriterionScore
+from statistics import median
+
+
+SCORE_BUCKETS = [(low, low + 10) for low in range(0, 100, 10)]
+
+
+def _in_bucket(value, low, high):
+    # The top bucket includes 100
+    return low <= value < high or (high == 100 and value == 100)
+
+
+def _median(values):
+    values = [v for v in values if v is not None]
+    return round(median(values), 2) if values else None
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+def _hours(deltas):
+    """Mean and median of a list of timedeltas, in hours"""
+    hours = [d.total_seconds() / 3600 for d in deltas if d is not None]
+    if not hours:
+        return {'mean': None, 'median': None}
+    return {'mean': round(sum(hours) / len(hours), 1), 'median': round(median(hours), 1)}
+
+
+def score_distribution(ai_marks, faculty_marks):
+    """AI and faculty mark counts per 10-mark bucket"""
+    counts = []
+    for low, high in SCORE_BUCKETS:
+        counts.append((
+            sum(1 for v in ai_marks if v is not None and _in_bucket(v, low, high)),
+            sum(1 for v in faculty_marks if v is not None and _in_bucket(v, low, high)),
+        ))
+    peak = max([count for pair in counts for count in pair] + [1])
+
+    return [{
+        'label': f'{low}-{high}',
+        'ai': ai,
+        'faculty': faculty,
+        'ai_width': round(ai * 100 / peak),
+        'faculty_width': round(faculty * 100 / peak),
+    } for (low, high), (ai, faculty) in zip(SCORE_BUCKETS, counts)]
+
+
+def criterion_summary(faculty):
+    """Mean (DB-side) and median per criterion across a faculty's evaluations"""
+    scores = CriterionScore.objects.filter(evaluation__faculty=faculty)
+
+    rows = scores.values('criteria_name').annotate(
+        max_marks=Max('max_marks'),
+        ai_count=Count('ai_score'),
+        faculty_count=Count('faculty_score'),
+        ai_mean=Avg('ai_score'),
+        faculty_mean=Avg('faculty_score'),
+    ).order_by('criteria_name')
+
+    # Medians need the values themselves - fetched in a single query
+    values = {}
+    for name, ai_score, faculty_score in scores.values_list('criteria_name', 'ai_score', 'faculty_score'):
+        ai_scores, faculty_scores = values.setdefault(name, ([], []))
+        ai_scores.append(ai_score)
+        faculty_scores.append(faculty_score)
+
+    summary = []
+    for row in rows:
+        ai_scores, faculty_scores = values.get(row['criteria_name'], ([], []))
+        summary.append({
+            'name': row['criteria_name'],
+            'max_marks': row['max_marks'],
+            'ai_count': row['ai_count'],
+            'faculty_count': row['faculty_count'],
+            'ai_mean': _round(row['ai_mean']),
+            'faculty_mean': _round(row['faculty_mean']),
+            'ai_median': _median(ai_scores),
+            'faculty_median': _median(faculty_scores),
+        })
+    return summary
+
+
+def faculty_analytics(faculty):
+    """Cohort statistics for all evaluations of a faculty's projects
+
+    Computed in Python from one fetch of the few columns needed: conditional
+    aggregates (FILTER/CASE, column arithmetic, ABS) aren't supported by djongo.
+    """
+    rows = list(ProjectEvaluation.objects.filter(faculty=faculty).values_list(
+        'ai_marks', 'faculty_marks', 'project__submitted_at', 'ai_evaluated_at', 'faculty_evaluated_at'
+    ))
+
+    ai_marks = [r[0] for r in rows if r[0] is not None]
+    faculty_marks = [r[1] for r in rows if r[1] is not None]
+    pairs = [(r[0], r[1]) for r in rows if r[0] is not None and r[1] is not None]
+    deltas = [ai - fac for ai, fac in pairs]
+
+    totals = {
+        'evaluations': len(rows),
+        'ai_count': len(ai_marks),
+        'faculty_count': len(faculty_marks),
+        'both_count': len(pairs),
+        'ai_mean': _mean(ai_marks),
+        'faculty_mean': _mean(faculty_marks),
+        'ai_median': _median(ai_marks),
+        'faculty_median': _median(faculty_marks),
+        'ai_min': _round(min(ai_marks, default=None)),
+        'ai_max': _round(max(ai_marks, default=None)),
+        'faculty_min': _round(min(faculty_marks, default=None)),
+        'faculty_max': _round(max(faculty_marks, default=None)),
+        'delta_mean': _mean(deltas),
+        'delta_median': _median(deltas),
+        'delta_abs_mean': _mean([abs(d) for d in deltas]),
+        'ai_higher': sum(1 for d in deltas if d > 0),
+        'faculty_higher': sum(1 for d in deltas if d < 0),
+    }
+
+    turnaround = {
+        'ai': _hours([r[3] - r[2] for r in rows if r[3] and r[2]]),
+        'faculty': _hours([r[4] - r[2] for r in rows if r[4] and r[2]]),
+    }
+
+    return {
+        'totals': totals,
+        'distribution': score_distribution(ai_marks, faculty_marks),
+        'criteria': criterion_summary(faculty),
+        'turnaround': turnaround,
+    }
@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+import hashlib
+import json
+import random
+import re
+import time
+
+
+class BackendError(Exception):
+    """Raised when an evaluator backend cannot produce a response"""
+
+
+class TransientBackendError(BackendError):
+    """Rate limiting or a temporary outage; the same request may succeed if retried"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class BaseEvaluatorBackend:
+    """Interface for the LLM that scores projects"""
+    model_name = ''
+    not_configured_message = 'AI evaluator backend is not configured.'
+
+    def is_configured(self):
+        return True
+
+    def generate(self, prompt, generation_config=None):
+        """Return the model's text response for a prompt"""
+        raise NotImplementedError
+
+
+def retry_info_delay(error):
+    """Seconds from the google.rpc.RetryInfo detail of a Google API error, if it has one"""
+    for detail in getattr(error, 'details', None) or []:
+        if isinstance(detail, dict):
+            # REST transport: {"@type": ".../google.rpc.RetryInfo", "retryDelay": "27s"}
+            delay = detail.get('retryDelay')
+            if isinstance(delay, str) and delay.endswith('s'):
+                try:
+                    return float(delay[:-1])
+                except ValueError:
+                    continue
+        elif hasattr(getattr(detail, 'retry_delay', None), 'seconds'):
+            # gRPC transport: error_details_pb2.RetryInfo
+            return detail.retry_delay.seconds + detail.retry_delay.nanos / 1e9
+    return None
+
+
+class GeminiBackend(BaseEvaluatorBackend):
+    """Google Gemini via the google-generativeai client"""
+    model_name = 'gemini-2.5-flash'
+    not_configured_message = 'Gemini API key not configured. Please add it to .env file.'
+
+    def is_configured(self):
+        return bool(settings.GEMINI_API_KEY)
+
+    def generate(self, prompt, generation_config=None):
+        import google.generativeai as genai
+        from google.api_core import exceptions as google_exceptions
+
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        model = genai.GenerativeModel(self.model_name)
+        try:
+            response = model.generate_content(prompt, generation_config=generation_config or None)
+        except (google_exceptions.TooManyRequests, google_exceptions.ResourceExhausted) as e:
+            raise TransientBackendError(f'Gemini rate limit: {e}', retry_after=retry_info_delay(e))
+        except (google_exceptions.ServiceUnavailable, google_exceptions.InternalServerError,
+                google_exceptions.DeadlineExceeded, google_exceptions.GatewayTimeout) as e:
+            raise TransientBackendError(f'Gemini temporarily unavailable: {e}')
+        return response.text
+
+
+class FakeBackend(BaseEvaluatorBackend):
+    """Offline stand-in with configurable latency and failure rate, for load testing"""
+    model_name = 'fake-evaluator'
+
+    def generate(self, prompt, generation_config=None):
+        latency = settings.EVALUATOR_FAKE_LATENCY
+        jitter = settings.EVALUATOR_FAKE_LATENCY_JITTER
+        time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+        if random.random() < settings.EVALUATOR_FAKE_FAILURE_RATE:
+            raise TransientBackendError('Simulated evaluator failure (429)')
+
+        criteria = re.findall(r'^- (.+?) \((\d+) marks\):', prompt, re.MULTILINE)
+        project_ids = re.findall(r'^=== PROJECT (P\d+) ===$', prompt, re.MULTILINE)
+
+        if project_ids:
+            return json.dumps({'projects': [
+                dict(self.fake_result(prompt + project_id, criteria), project_id=project_id)
+                for project_id in project_ids
+            ]})
+
+        return json.dumps(self.fake_result(prompt, criteria))
+
+    def fake_result(self, seed_text, criteria):
+        # Same prompt always gets the same scores
+        seed = int(hashlib.sha256(seed_text.encode('utf-8')).hexdigest()[:8], 16)
+        return {
+            'summary': 'Simulated evaluation generated by the fake evaluator backend.',
+            'criteria': [{
+                'name': name,
+                'score': round(int(max_marks) * (0.5 + ((seed >> index) % 45) / 100), 1),
+                'feedback': ['Placeholder feedback point', 'Placeholder feedback point'],
+            } for index, (name, max_marks) in enumerate(criteria)],
+            'strengths': ['Placeholder strength'],
+            'improvements': ['Placeholder improvement'],
+        }
+
+
+def get_backend():
+    """Instantiate the backend named by settings.EVALUATOR_BACKEND"""
+    return import_string(settings.EVALUATOR_BACKEND)()
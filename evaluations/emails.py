@@ -0,0 +1,27 @@
+from notifications.services import build_email, site_url
+
+
+def results_ready_email(evaluation, student):
+    """Unsaved outbox email telling a team member their project's marks are out"""
+    project = evaluation.project
+    subject = f'Evaluation Results Available - {project.project_name}'
+
+    results_url = site_url('student_results')
+
+    message = f"""Dear {student.full_name},
+
+The evaluation of your project "{project.project_name}" (team {project.team.team_name}) is complete.
+
+AI Evaluation: {evaluation.ai_marks} / 100
+Faculty Evaluation: {evaluation.faculty_marks} / 100
+
+Login to see the detailed feedback:
+{results_url}
+
+Faculty: {project.team.faculty.full_name}
+
+Best regards,
+AI Project Evaluator System
+"""
+
+    return build_email(subject, message, [student.user.email])
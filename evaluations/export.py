@@ -0,0 +1,74 @@
+from django.utils import timezone
+from projects.models import TeamMember
+import csv
+
+
+EXPORT_HEADER = [
+    'Team', 'Faculty ID', 'Faculty', 'Department', 'USN', 'Student', 'Leader',
+    'Project', 'Status', 'Submitted At', 'AI Marks', 'Faculty Marks',
+    'AI Evaluated At', 'Faculty Evaluated At',
+]
+
+EXPORT_FIELDS = (
+    'team__team_name',
+    'team__faculty__faculty_id',
+    'team__faculty__full_name',
+    'team__faculty__department',
+    'student__usn',
+    'student__full_name',
+    'is_leader',
+    'team__project__project_name',
+    'team__project__status',
+    'team__project__submitted_at',
+    'team__project__evaluation__ai_marks',
+    'team__project__evaluation__faculty_marks',
+    'team__project__evaluation__ai_evaluated_at',
+    'team__project__evaluation__faculty_evaluated_at',
+)
+
+# Leading characters spreadsheets treat as the start of a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
+
+def result_rows(faculty=None, department=None):
+    """One row per team member with marks, read in chunks from a single joined query"""
+    members = TeamMember.objects.all()
+    if faculty is not None:
+        members = members.filter(team__faculty=faculty)
+    if department is not None:
+        members = members.filter(team__faculty__department=department)
+
+    rows = members.order_by('team__team_name', '-is_leader', 'student__usn').values_list(*EXPORT_FIELDS)
+
+    tz = timezone.get_current_timezone()
+    for row in rows.iterator(chunk_size=2000):
+        row = list(row)
+        row[6] = 'Yes' if row[6] else 'No'
+        for index in (9, 12, 13):
+            if row[index] is not None:
+                row[index] = row[index].astimezone(tz).strftime('%Y-%m-%d %H:%M')
+        yield row
+
+
+def csv_cell(value):
+    """Cell value safe to open in a spreadsheet: blanks for None, text formulas quoted"""
+    if value is None:
+        return ''
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows):
+    """Yield CSV lines for the header and rows without building the file in memory"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for row in rows:
+        yield writer.writerow([csv_cell(value) for value in row])
@@ -0,0 +1,262 @@
+from django.conf import settings
+from django.db import IntegrityError
+import json
+import multiprocessing
+import threading
+import PyPDF2
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+EMPTY_TEXT_MESSAGE = "Unable to extract text from PDF. The file may be image-based or encrypted."
+
+
+class ExtractionError(Exception):
+    """Raised when a report could not be extracted in an extraction process"""
+
+
+class ExtractionTimeout(ExtractionError):
+    """Raised when a report takes longer than PDF_EXTRACTION_TIMEOUT to extract"""
+
+
+def iter_page_text(pages):
+    """Yield the text of each page, parsing pages only as they are consumed"""
+    for page in pages:
+        yield page.extract_text() or ""
+
+
+def iter_pdf_pages(pdf_path):
+    """Yield the text of each PDF page, parsing pages only as they are consumed"""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        yield from iter_page_text(pdf_reader.pages)
+
+
+def collect_page_text(page_texts, char_budget):
+    """Join page texts up to char_budget characters, returning (text, is_complete)"""
+    parts = []
+    length = 0
+    is_complete = True
+
+    for page_text in page_texts:
+        if page_text:
+            parts.append(page_text)
+            length += len(page_text) + 2
+        if length >= char_budget:
+            # Budget reached - leave the remaining pages unparsed
+            is_complete = False
+            break
+
+    text = "\n\n".join(parts)
+    if len(text) > char_budget:
+        text = text[:char_budget]
+        is_complete = False
+
+    return text, is_complete
+
+
+def read_pdf_text(pdf_path, char_budget=None):
+    """Raw text of a PDF up to char_budget characters, raising if it can't be read
+
+    Returns (text, is_complete); pages past the budget are never parsed.
+    """
+    if char_budget is None:
+        char_budget = settings.EVALUATION_REPORT_CHAR_BUDGET
+
+    return collect_page_text(iter_pdf_pages(pdf_path), char_budget)
+
+
+def read_pdf_report(pdf_path, char_budget=None):
+    """Budgeted text plus page count and document info of a PDF"""
+    if char_budget is None:
+        char_budget = settings.EVALUATION_REPORT_CHAR_BUDGET
+
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        text, is_complete = collect_page_text(iter_page_text(pdf_reader.pages), char_budget)
+
+        metadata = {}
+        try:
+            info = pdf_reader.metadata or {}
+            for key in ('/Title', '/Author', '/Creator', '/Producer', '/CreationDate'):
+                if info.get(key):
+                    metadata[key.lstrip('/').lower()] = str(info.get(key))
+        except Exception:
+            pass  # Broken or encrypted info dictionaries are not worth failing over
+
+        return {
+            'text': text,
+            'is_complete': is_complete,
+            'page_count': len(pdf_reader.pages),
+            'metadata': metadata,
+        }
+
+
+# ============= EXTRACTION PROCESSES =============
+
+_slots = None
+_slots_lock = threading.Lock()
+
+
+def _limit_worker_memory(limit_mb):
+    """Cap the address space of an extraction process"""
+    if resource and limit_mb:
+        limit = limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _get_slots():
+    """Semaphore limiting concurrent extractions to PDF_EXTRACTION_PROCESSES"""
+    global _slots
+    with _slots_lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(settings.PDF_EXTRACTION_PROCESSES)
+        return _slots
+
+
+def _run_in_child(conn, limit_mb, func, args):
+    """Extraction process entry point: send back ('ok', result) or ('error', exception)"""
+    try:
+        _limit_worker_memory(limit_mb)
+        conn.send(('ok', func(*args)))
+    except (FileNotFoundError, ExtractionError) as e:
+        conn.send(('error', e))
+    except MemoryError:
+        conn.send(('error', ExtractionError('PDF extraction exceeded the memory limit')))
+    except Exception as e:
+        # Library exceptions may not survive pickling, so send a plain message
+        conn.send(('error', ExtractionError(str(e))))
+    finally:
+        conn.close()
+
+
+def run_isolated(func, args, timeout=None):
+    """Run an extraction function in its own process with a per-document timeout
+
+    Each call gets a dedicated process, so a stuck document is killed without
+    touching extractions running for other threads.
+    Raises FileNotFoundError, ExtractionTimeout or ExtractionError.
+    With PDF_EXTRACTION_PROCESSES = 0 it runs inline.
+    """
+    if timeout is None:
+        timeout = settings.PDF_EXTRACTION_TIMEOUT
+
+    if not settings.PDF_EXTRACTION_PROCESSES:
+        return func(*args)
+
+    with _get_slots():
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_run_in_child,
+            args=(sender, settings.PDF_EXTRACTION_MEMORY_LIMIT_MB, func, args),
+            daemon=True
+        )
+        process.start()
+        sender.close()
+
+        try:
+            if not receiver.poll(timeout):
+                raise ExtractionTimeout(f'PDF extraction timed out after {timeout} seconds')
+            outcome, value = receiver.recv()
+        except EOFError:
+            # The process died without answering, e.g. killed for exceeding the memory limit
+            raise ExtractionError('PDF extraction process exited unexpectedly')
+        finally:
+            if process.is_alive():
+                process.kill()
+            process.join()
+            receiver.close()
+
+    if outcome == 'error':
+        raise value
+    return value
+
+
+def extract_text_isolated(pdf_path, char_budget=None, timeout=None):
+    """read_pdf_text run in an extraction process, returning (text, is_complete)"""
+    if char_budget is None:
+        char_budget = settings.EVALUATION_REPORT_CHAR_BUDGET
+    return run_isolated(read_pdf_text, (pdf_path, char_budget), timeout)
+
+
+def extract_report_isolated(pdf_path, char_budget=None, timeout=None):
+    """read_pdf_report run in an extraction process"""
+    if char_budget is None:
+        char_budget = settings.EVALUATION_REPORT_CHAR_BUDGET
+    return run_isolated(read_pdf_report, (pdf_path, char_budget), timeout)
+
+
+# ============= REPORT TEXT =============
+
+def index_report(project, char_budget=None):
+    """Extract and store text, page count and metadata for a project's report
+
+    Called at upload time so evaluations only have to read the stored record.
+    """
+    # Imported here so extraction processes can load this module without Django set up
+    from projects.models import Project, ReportText, compute_file_sha256
+
+    if char_budget is None:
+        char_budget = settings.EVALUATION_REPORT_CHAR_BUDGET
+
+    if not project.report_sha256:
+        # Reports uploaded before hashing was added
+        project.report_sha256 = compute_file_sha256(project.project_report)
+        Project.objects.filter(id=project.id).update(report_sha256=project.report_sha256)
+
+    existing = ReportText.objects.filter(sha256=project.report_sha256).first()
+    if existing is not None and existing.covers(char_budget) and existing.page_count is not None:
+        return existing
+
+    report = extract_report_isolated(project.project_report.path, char_budget)
+    fields = {
+        'text': report['text'],
+        'char_budget': char_budget,
+        'is_complete': report['is_complete'],
+        'page_count': report['page_count'],
+        'metadata': json.dumps(report['metadata']),
+    }
+
+    try:
+        report_text, created = ReportText.objects.update_or_create(
+            sha256=project.report_sha256,
+            defaults=fields
+        )
+    except IntegrityError:
+        # Another process indexed the same report first
+        report_text = ReportText.objects.get(sha256=project.report_sha256)
+
+    return report_text
+
+
+def get_report_text(project, char_budget=None):
+    """Report text for a project, read from the record stored at upload time
+
+    Raises FileNotFoundError or ExtractionError if there is no usable text, so an
+    unreadable report is never sent to the evaluator as if it were the report.
+    """
+    from projects.models import ReportText
+
+    if char_budget is None:
+        char_budget = settings.EVALUATION_REPORT_CHAR_BUDGET
+
+    report_text = None
+    if project.report_sha256:
+        report_text = ReportText.objects.filter(sha256=project.report_sha256).first()
+
+    if report_text is None or not report_text.covers(char_budget):
+        # Not indexed at upload (older report or failed indexing) - extract now
+        try:
+            report_text = index_report(project, char_budget)
+        except (FileNotFoundError, ExtractionError):
+            raise
+        except Exception as e:
+            raise ExtractionError(f'Error extracting PDF: {e}')
+
+    if not report_text.text.strip():
+        raise ExtractionError(EMPTY_TEXT_MESSAGE)
+
+    return report_text.text[:char_budget]
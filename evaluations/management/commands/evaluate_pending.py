@@ -0,0 +1,129 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from accounts.models import Faculty
+from evaluations.services import process_job_batch, start_job
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Run AI evaluation for every submitted project, a few at a time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--faculty', help='Faculty ID to evaluate projects for (default: all faculty)')
+        parser.add_argument('--concurrency', type=int, default=settings.EVALUATION_BATCH_CONCURRENCY,
+                            help='Number of projects evaluated in parallel')
+        parser.add_argument('--batch-size', type=int, default=settings.EVALUATION_BATCH_PROMPT_SIZE,
+                            help='Projects of one faculty scored per evaluator call')
+        parser.add_argument('--force', action='store_true',
+                            help='Re-evaluate projects that already have AI marks, ignoring cached AI responses')
+
+    def handle(self, *args, **options):
+        projects = Project.objects.filter(status='submitted').select_related('team', 'team__faculty')
+        if not options['force']:
+            # Projects that already have AI marks are only re-evaluated with --force
+            projects = projects.filter(evaluation__ai_marks__isnull=True)
+
+        if options['faculty']:
+            try:
+                faculty = Faculty.objects.get(faculty_id=options['faculty'])
+            except Faculty.DoesNotExist:
+                raise CommandError(f'Faculty {options["faculty"]} not found.')
+            projects = projects.filter(team__faculty=faculty)
+
+        projects = list(projects)
+        total = len(projects)
+        concurrency = max(1, options['concurrency'])
+
+        if not total:
+            self.stdout.write('No submitted projects waiting for AI evaluation.')
+            return
+
+        batch_size = max(1, options['batch_size'])
+
+        # Batches never mix faculty, since a batch shares one criteria list
+        by_faculty = {}
+        for project in projects:
+            by_faculty.setdefault(project.team.faculty_id, []).append(project)
+        batches = [
+            group[i:i + batch_size]
+            for group in by_faculty.values()
+            for i in range(0, len(group), batch_size)
+        ]
+
+        self.stdout.write(
+            f'Evaluating {total} project(s) in {len(batches)} batch(es) with concurrency {concurrency}'
+        )
+
+        started = time.monotonic()
+        done = 0
+        succeeded = []
+        failed = []
+        skipped = []
+        deferred = []
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(self.evaluate, batch, options['force']) for batch in batches]
+
+            for future in as_completed(futures):
+                results, elapsed = future.result()
+                for project, job in results:
+                    done += 1
+                    prefix = f'[{done}/{total}] {project.project_name}'
+
+                    if job is None:
+                        skipped.append(project)
+                        self.stdout.write(self.style.WARNING(f'{prefix}: skipped, already queued or running'))
+                    elif job.status == 'done':
+                        succeeded.append(project)
+                        self.stdout.write(self.style.SUCCESS(
+                            f'{prefix}: {project.evaluation.ai_marks}/100 ({elapsed:.1f}s)'
+                        ))
+                        for stage, stage_stats in job.stats_data.items():
+                            self.stdout.write(f'    {stage}: {self.format_stats(stage_stats)}')
+                    elif job.status == 'queued':
+                        deferred.append(project)
+                        self.stdout.write(self.style.WARNING(
+                            f'{prefix}: deferred, evaluator unavailable - left queued for the worker'
+                        ))
+                    else:
+                        failed.append((project, job.error_message))
+                        self.stdout.write(self.style.ERROR(f'{prefix}: {job.error_message} ({elapsed:.1f}s)'))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write('')
+        self.stdout.write(
+            f'Finished in {elapsed:.1f}s: {len(succeeded)} evaluated, '
+            f'{len(failed)} failed, {len(deferred)} deferred, {len(skipped)} skipped'
+        )
+        for project, error in failed:
+            self.stdout.write(f'  - {project.project_name}: {error}')
+
+    def format_stats(self, stage_stats):
+        return (
+            f"{stage_stats.get('calls', 0)} call(s), {stage_stats.get('cache_hits', 0)} cached, "
+            f"~{stage_stats.get('input_tokens', 0)} in / ~{stage_stats.get('output_tokens', 0)} out tokens, "
+            f"{stage_stats.get('seconds', 0)}s"
+        )
+
+    def evaluate(self, batch, force_refresh):
+        """Evaluate a batch of one faculty's projects on a pool thread"""
+        started = time.monotonic()
+        try:
+            faculty = batch[0].team.faculty
+            jobs = {}
+            for project in batch:
+                job = start_job(project, faculty, force_refresh=force_refresh)
+                if job is not None:
+                    jobs[project.id] = job
+
+            if jobs:
+                process_job_batch(list(jobs.values()))
+            return [(project, jobs.get(project.id)) for project in batch], time.monotonic() - started
+        finally:
+            # Each thread has its own DB connection
+            connection.close()
@@ -0,0 +1,63 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from evaluations.ratelimit import get_breaker
+from evaluations.services import claim_job_batch, process_job_batch, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = 'Process queued AI evaluation jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue and exit instead of polling forever')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--stale-after', type=int, default=600,
+                            help='Requeue running jobs with no heartbeat for this many seconds')
+        parser.add_argument('--batch-size', type=int, default=settings.EVALUATION_BATCH_PROMPT_SIZE,
+                            help='Projects of one faculty scored per evaluator call')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Evaluation worker started')
+
+        while True:
+            close_old_connections()
+
+            requeued = requeue_stale_jobs(options['stale_after'])
+            if requeued:
+                self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale job(s)'))
+
+            # While the circuit breaker is open, jobs stay queued rather than failing fast one by one
+            wait = get_breaker().seconds_until_retry()
+            if wait:
+                if options['once']:
+                    self.stdout.write(self.style.WARNING('Evaluator circuit breaker is open, leaving jobs queued'))
+                    break
+                time.sleep(min(wait, max(options['poll_interval'], 1.0)))
+                continue
+
+            jobs = claim_job_batch(options['batch_size'])
+
+            if not jobs:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            for job in jobs:
+                self.stdout.write(f'Running job {job.id} for "{job.project.project_name}"')
+            process_job_batch(jobs)
+
+            for job in jobs:
+                if job.status == 'done':
+                    self.stdout.write(self.style.SUCCESS(f'Job {job.id} done'))
+                elif job.status == 'queued':
+                    self.stdout.write(self.style.WARNING(f'Job {job.id} deferred, evaluator unavailable'))
+                else:
+                    self.stdout.write(self.style.ERROR(f'Job {job.id} failed: {job.error_message}'))
+
+        self.stdout.write('Evaluation worker stopped')
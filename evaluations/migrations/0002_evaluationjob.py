@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-17 02:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_auto_20251121_0806'),
+        ('projects', '0002_auto_20251121_0806'),
+        ('evaluations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvaluationJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='queued', max_length=20)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='evaluation_jobs', to='accounts.faculty')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='evaluation_jobs', to='projects.project')),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-17 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0002_evaluationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationjob',
+            name='force_refresh',
+            field=models.BooleanField(default=False, help_text='Bypass the cached AI response'),
+        ),
+    ]
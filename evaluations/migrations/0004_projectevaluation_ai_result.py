@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-17 02:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0003_evaluationjob_force_refresh'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectevaluation',
+            name='ai_result',
+            field=models.TextField(blank=True, help_text='JSON string of the structured AI evaluation', null=True),
+        ),
+    ]
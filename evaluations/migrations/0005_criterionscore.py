@@ -0,0 +1,31 @@
+# Generated by Django 3.2.25 on 2026-10-17 02:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0004_projectevaluation_ai_result'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CriterionScore',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('criteria_name', models.CharField(db_index=True, max_length=200)),
+                ('max_marks', models.IntegerField()),
+                ('ai_score', models.FloatField(blank=True, null=True)),
+                ('faculty_score', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('criterion', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scores', to='evaluations.evaluationcriteria')),
+                ('evaluation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='criterion_scores', to='evaluations.projectevaluation')),
+            ],
+            options={
+                'unique_together': {('evaluation', 'criteria_name')},
+            },
+        ),
+    ]
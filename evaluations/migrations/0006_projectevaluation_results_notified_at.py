@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-17 03:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0005_criterionscore'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectevaluation',
+            name='results_notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
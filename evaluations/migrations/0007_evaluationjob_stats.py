@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-17 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0006_projectevaluation_results_notified_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationjob',
+            name='stats',
+            field=models.TextField(blank=True, help_text='JSON string of per-stage latency and token counts', null=True),
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from projects.models import Project
 from accounts.models import Faculty
 from django.utils import timezone
+from django.utils.safestring import mark_safe
 import uuid
 import json
 
@@ -30,12 +31,14 @@ class ProjectEvaluation(models.Model):
     # AI Evaluation - Changed to FloatField to avoid Decimal issues
     ai_marks = models.FloatField(null=True, blank=True)
     ai_feedback = models.TextField(blank=True, null=True)
+    ai_result = models.TextField(blank=True, null=True, help_text='JSON string of the structured AI evaluation')
     ai_evaluated_at = models.DateTimeField(null=True, blank=True)
 
     # Faculty Evaluation - Changed to FloatField to avoid Decimal issues
     faculty_marks = models.FloatField(null=True, blank=True)
     faculty_feedback = models.TextField(blank=True, null=True)
     faculty_evaluated_at = models.DateTimeField(null=True, blank=True)
+    results_notified_at = models.DateTimeField(null=True, blank=True)
 
     # Criteria used for evaluation
     evaluation_criteria = models.TextField(help_text='JSON string of criteria used')
@@ -46,6 +49,73 @@ class ProjectEvaluation(models.Model):
     def __str__(self):
         return f"Evaluation - {self.project.project_name}"
 
+    @property
+    def ai_result_data(self):
+        return json.loads(self.ai_result) if self.ai_result else None
+
+    @property
+    def ai_feedback_html(self):
+        """Feedback for templates: only HTML rendered from ai_result is trusted, older free text is escaped"""
+        if self.ai_result and self.ai_feedback:
+            return mark_safe(self.ai_feedback)
+        return self.ai_feedback
+
     @property
     def is_fully_evaluated(self):
-        return self.ai_marks is not None and self.faculty_marks is not None
\ No newline at end of file
+        return self.ai_marks is not None and self.faculty_marks is not None
+
+
+class CriterionScore(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    evaluation = models.ForeignKey(ProjectEvaluation, on_delete=models.CASCADE, related_name='criterion_scores')
+    criterion = models.ForeignKey(EvaluationCriteria, on_delete=models.SET_NULL, null=True, blank=True,
+                                  related_name='scores')
+
+    # Snapshot of the criterion at evaluation time, kept if the criterion is edited or deleted
+    criteria_name = models.CharField(max_length=200, db_index=True)
+    max_marks = models.IntegerField()
+
+    ai_score = models.FloatField(null=True, blank=True)
+    faculty_score = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('evaluation', 'criteria_name')
+
+    def __str__(self):
+        return f"{self.criteria_name} - {self.evaluation.project.project_name}"
+
+
+class EvaluationJob(models.Model):
+    STATUS_CHOICES = (
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='evaluation_jobs')
+    faculty = models.ForeignKey(Faculty, on_delete=models.CASCADE, related_name='evaluation_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', db_index=True)
+    force_refresh = models.BooleanField(default=False, help_text='Bypass the cached AI response')
+    error_message = models.TextField(blank=True, null=True)
+    stats = models.TextField(blank=True, null=True, help_text='JSON string of per-stage latency and token counts')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True, help_text='Last sign of life from the worker running the job')
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created_at',)
+
+    def __str__(self):
+        return f"AI Job ({self.status}) - {self.project.project_name}"
+
+    @property
+    def is_active(self):
+        return self.status in ('queued', 'running')
+
+    @property
+    def stats_data(self):
+        return json.loads(self.stats) if self.stats else {}
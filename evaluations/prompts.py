@@ -0,0 +1,242 @@
+from django.conf import settings
+import math
+import re
+
+
+# Rough average for English prose with the Gemini/GPT tokenizers
+CHARS_PER_TOKEN = 4
+
+# Sections are cut into chunks of about this many tokens before scoring
+CHUNK_TOKENS = 250
+
+STOPWORDS = {
+    'the', 'and', 'for', 'are', 'was', 'were', 'with', 'that', 'this', 'from', 'into', 'its', 'has',
+    'have', 'had', 'not', 'but', 'all', 'any', 'can', 'will', 'which', 'their', 'them', 'they', 'been',
+    'also', 'such', 'than', 'then', 'there', 'these', 'those', 'use', 'used', 'using', 'how', 'what',
+    'our', 'out', 'one', 'two', 'each', 'other', 'more', 'most', 'should', 'would', 'could', 'may',
+    'project', 'quality', 'overall', 'well', 'good',
+}
+
+NUMBERED_HEADING = re.compile(r'^(?:(?:chapter|section)\s+)?\d+(?:\.\d+)*\.?\s+[A-Za-z]', re.IGNORECASE)
+WORD_PATTERN = re.compile(r'[a-z][a-z0-9]{2,}')
+
+
+def estimate_tokens(text):
+    """Fast local estimate of the tokens a text costs, without calling a tokenizer"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def terms(text):
+    """Lower-cased content words of a text, with a crude plural/suffix strip"""
+    words = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        for suffix in ('ation', 'ing', 'es', 's'):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+                word = word[:-len(suffix)]
+                break
+        words.append(word)
+    return words
+
+
+def _is_heading(line):
+    """Short numbered, upper-case or title-case line, e.g. 3.1 Methodology or RESULTS"""
+    words = line.split()
+    if len(line) > 60 or len(words) > 8 or line.endswith(('.', ',', ';')):
+        return False
+    if NUMBERED_HEADING.match(line):
+        return True
+
+    letters = [c for c in line if c.isalpha()]
+    if len(letters) >= 4 and all(c.isupper() for c in letters):
+        return True
+
+    significant = [w for w in words if len(w) > 3]
+    return len(words) <= 6 and bool(significant) and all(w[0].isupper() for w in significant)
+
+
+def _split_long_line(line, max_chars):
+    """Pieces of at most max_chars, broken at whitespace where possible
+
+    PDF text often comes out as one huge line per page, which would otherwise become
+    a single chunk too big for any prompt budget.
+    """
+    while len(line) > max_chars:
+        cut = line.rfind(' ', 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        yield line[:cut].rstrip()
+        line = line[cut:].lstrip()
+    if line:
+        yield line
+
+
+def split_sections(text):
+    """Split report text into chunks of at most ~CHUNK_TOKENS, each tagged with its heading"""
+    chunks = []
+    heading = ''
+    buffer = []
+
+    def flush():
+        if buffer:
+            body = ' '.join(buffer).strip()
+            if body:
+                chunks.append({'heading': heading, 'text': body})
+            buffer.clear()
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        if _is_heading(line):
+            flush()
+            heading = line
+            continue
+
+        for piece in _split_long_line(line, CHUNK_TOKENS * CHARS_PER_TOKEN):
+            if buffer and estimate_tokens(' '.join(buffer + [piece])) > CHUNK_TOKENS:
+                flush()
+            buffer.append(piece)
+
+    flush()
+
+    for chunk in chunks:
+        chunk['tokens'] = estimate_tokens(chunk['heading'] + '\n' + chunk['text'])
+    return chunks
+
+
+def group_sections(text, chunk_tokens):
+    """Consecutive sections merged into texts of about chunk_tokens each, for summarizing"""
+    groups = []
+    parts = []
+    size = 0
+    last_heading = None
+
+    for chunk in split_sections(text):
+        if parts and size + chunk['tokens'] > chunk_tokens:
+            groups.append('\n\n'.join(parts))
+            parts = []
+            size = 0
+            last_heading = None
+
+        if chunk['heading'] and chunk['heading'] != last_heading:
+            parts.append(chunk['heading'])
+            last_heading = chunk['heading']
+        parts.append(chunk['text'])
+        size += chunk['tokens']
+
+    if parts:
+        groups.append('\n\n'.join(parts))
+    return groups
+
+
+def score_chunks(chunks, criteria_list):
+    """Relevance of every chunk to every criterion, as {criterion index: [score per chunk]}
+
+    TF-IDF style: criterion terms found in a chunk count for more when they are rare across
+    the report, with diminishing returns for repeats and extra weight for heading matches.
+    """
+    chunk_terms = []
+    document_frequency = {}
+    for chunk in chunks:
+        body_terms = terms(chunk['text'])
+        counts = {}
+        for term in body_terms:
+            counts[term] = counts.get(term, 0) + 1
+        chunk_terms.append((counts, set(terms(chunk['heading']))))
+        for term in counts:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+
+    total = len(chunks)
+    scores = {}
+    for index, criterion in enumerate(criteria_list):
+        query = set(terms(f'{criterion.criteria_name} {criterion.criteria_description}'))
+        criterion_scores = []
+        for counts, heading_terms in chunk_terms:
+            score = 0.0
+            for term in query:
+                idf = math.log(1 + total / (1 + document_frequency.get(term, 0)))
+                frequency = counts.get(term, 0)
+                score += idf * frequency / (frequency + 1.2)
+                if term in heading_terms:
+                    score += 2 * idf
+            criterion_scores.append(score)
+        scores[index] = criterion_scores
+    return scores
+
+
+def pack_report(text, criteria_list, token_budget=None):
+    """Report text reduced to the chunks most relevant to the criteria, within token_budget
+
+    The opening chunk (abstract/introduction) is always kept for context, then criteria take
+    turns claiming their best remaining chunk so every criterion gets evidence. Chunks are
+    returned in document order, with gaps marked.
+    """
+    if token_budget is None:
+        token_budget = settings.EVALUATION_PROMPT_TOKEN_BUDGET
+
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    chunks = split_sections(text)
+    if not chunks:
+        return text[:token_budget * CHARS_PER_TOKEN]
+
+    scores = score_chunks(chunks, criteria_list)
+    rankings = [
+        sorted((i for i in range(len(chunks)) if scores[c][i] > 0), key=lambda i: -scores[c][i])
+        for c in range(len(criteria_list))
+    ]
+
+    selected = set()
+    used = 0
+
+    def take(i):
+        nonlocal used
+        if i in selected or used + chunks[i]['tokens'] > token_budget:
+            return False
+        selected.add(i)
+        used += chunks[i]['tokens']
+        return True
+
+    take(0)
+
+    # Round-robin over criteria until no criterion can add another chunk
+    positions = [0] * len(rankings)
+    progress = True
+    while progress:
+        progress = False
+        for c, ranking in enumerate(rankings):
+            while positions[c] < len(ranking):
+                i = ranking[positions[c]]
+                positions[c] += 1
+                if take(i):
+                    progress = True
+                    break
+
+    # Fill what is left with the chunks most relevant to the criteria overall
+    for i in sorted(range(len(chunks)), key=lambda i: (-sum(scores[c][i] for c in scores), i)):
+        take(i)
+
+    if not selected:
+        # Budget smaller than any chunk
+        return text[:token_budget * CHARS_PER_TOKEN]
+
+    parts = []
+    last_heading = None
+    previous = -1
+    for i in sorted(selected):
+        chunk = chunks[i]
+        if i != previous + 1:
+            parts.append('[...]')
+        if chunk['heading'] and chunk['heading'] != last_heading:
+            parts.append(chunk['heading'])
+            last_heading = chunk['heading']
+        parts.append(chunk['text'])
+        previous = i
+    if previous != len(chunks) - 1:
+        parts.append('[...]')
+
+    return '\n\n'.join(parts)
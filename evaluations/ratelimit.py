@@ -0,0 +1,263 @@
+from django.conf import settings
+from contextlib import contextmanager
+from .backends import BackendError, TransientBackendError
+import json
+import os
+import random
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows - the limit is then per process
+    fcntl = None
+
+
+class RateLimitTimeout(BackendError):
+    """Raised when no evaluator call slot frees up within EVALUATOR_RATE_LIMIT_TIMEOUT"""
+
+
+class CircuitOpenError(BackendError):
+    """Raised without calling the evaluator while the circuit breaker is open"""
+
+    def __init__(self, message, retry_at=None):
+        super().__init__(message)
+        self.retry_at = retry_at
+
+
+_local_lock = threading.Lock()
+
+
+@contextmanager
+def shared_state(path):
+    """Read-modify-write a JSON state file under an exclusive lock shared by all processes"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a+') as file:
+        if fcntl:
+            fcntl.flock(file, fcntl.LOCK_EX)
+        else:
+            _local_lock.acquire()
+        try:
+            file.seek(0)
+            try:
+                state = json.loads(file.read() or '{}')
+            except ValueError:
+                state = {}
+
+            yield state
+
+            file.seek(0)
+            file.truncate()
+            file.write(json.dumps(state))
+            file.flush()
+        finally:
+            if fcntl:
+                fcntl.flock(file, fcntl.LOCK_UN)
+            else:
+                _local_lock.release()
+
+
+def read_shared_state(path):
+    """Current contents of a state file under a shared lock, without writing it back"""
+    try:
+        file = open(path)
+    except FileNotFoundError:
+        return {}
+
+    with file:
+        if fcntl:
+            fcntl.flock(file, fcntl.LOCK_SH)
+        try:
+            return json.loads(file.read() or '{}')
+        except ValueError:
+            return {}
+        finally:
+            if fcntl:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class SharedLimiter:
+    """Token bucket and retry budget kept in one file, shared by every process on the host
+
+    The bucket refills at rate_per_minute up to burst calls. The retry budget earns
+    retry_ratio of a retry per call up to retry_max, and each retry spends one, so
+    retries can't multiply load while the evaluator is struggling.
+    """
+
+    def __init__(self, path, rate_per_minute, burst, retry_ratio, retry_max):
+        self.path = path
+        self.rate_per_second = rate_per_minute / 60.0
+        self.burst = max(1, burst)
+        self.retry_ratio = retry_ratio
+        self.retry_max = retry_max
+
+    def state(self):
+        return shared_state(self.path)
+
+    def acquire(self, timeout):
+        """Take one call slot, waiting for the bucket to refill for at most timeout seconds"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.state() as state:
+                now = time.time()
+                elapsed = max(0.0, now - state.get('updated', now))
+                if self.rate_per_second > 0:
+                    tokens = min(self.burst, state.get('tokens', self.burst) + elapsed * self.rate_per_second)
+                else:
+                    tokens = self.burst  # Unlimited; the file still carries the retry budget
+                state['updated'] = now
+
+                if tokens >= 1:
+                    state['tokens'] = tokens - 1
+                    state['retry_budget'] = min(
+                        self.retry_max, state.get('retry_budget', self.retry_max) + self.retry_ratio
+                    )
+                    return
+
+                state['tokens'] = tokens
+                wait = (1 - tokens) / self.rate_per_second
+
+            if time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(f'No evaluator call slot free within {timeout} seconds')
+            # A little jitter so waiting processes don't all wake at the same instant
+            time.sleep(wait + random.uniform(0, 0.1))
+
+    def spend_retry(self):
+        """Take one retry from the shared budget, or return False if it is used up"""
+        with self.state() as state:
+            budget = state.get('retry_budget', self.retry_max)
+            if budget < 1:
+                return False
+            state['retry_budget'] = budget - 1
+            return True
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker around the evaluator, shared through a state file
+
+    After threshold consecutive transient failures the breaker opens and calls fail at once
+    for cooldown seconds. Then a single probe call is let through (half-open): success
+    closes the breaker, failure opens it for another cooldown.
+    """
+
+    def __init__(self, path, threshold, cooldown):
+        self.path = path
+        self.threshold = threshold
+        self.cooldown = cooldown
+
+    def allow(self):
+        """Whether a call may go ahead now; in half-open state only one probe at a time does"""
+        if self.threshold <= 0:
+            return True
+        if read_shared_state(self.path).get('state', 'closed') == 'closed':
+            return True
+
+        with shared_state(self.path) as state:
+            now = time.time()
+            if state.get('state', 'closed') == 'closed':
+                return True
+
+            # A probe that never reported back (its process died) stops blocking after a cooldown
+            if now - max(state.get('opened_at', 0), state.get('probe_at', 0)) < self.cooldown:
+                return False
+
+            state['state'] = 'half_open'
+            state['probe_at'] = now
+            return True
+
+    def record_success(self):
+        if self.threshold <= 0:
+            return
+        state = read_shared_state(self.path)
+        if state.get('state', 'closed') == 'closed' and not state.get('failures'):
+            return  # The common case needs no write
+        with shared_state(self.path) as state:
+            if state.get('state', 'closed') != 'closed':
+                print('Evaluator circuit breaker closed')
+            state.update({'state': 'closed', 'failures': 0})
+
+    def record_failure(self):
+        if self.threshold <= 0:
+            return
+        with shared_state(self.path) as state:
+            state['failures'] = state.get('failures', 0) + 1
+            if state.get('state') == 'half_open' or state['failures'] >= self.threshold:
+                if state.get('state') != 'open':
+                    print(f"Evaluator circuit breaker opened after {state['failures']} consecutive failure(s)")
+                state['state'] = 'open'
+                state['opened_at'] = time.time()
+
+    def status(self):
+        """Current state for display, with retry_at (epoch seconds) of the next probe"""
+        if self.threshold <= 0:
+            return {'state': 'closed', 'failures': 0, 'retry_at': None}
+
+        # Read-only: this runs on every evaluate page load
+        state = read_shared_state(self.path)
+        current = state.get('state', 'closed')
+        retry_at = None
+        if current != 'closed':
+            retry_at = max(state.get('opened_at', 0), state.get('probe_at', 0)) + self.cooldown
+        return {'state': current, 'failures': state.get('failures', 0), 'retry_at': retry_at}
+
+    def seconds_until_retry(self):
+        """0 if calls may be attempted now, else seconds until the next probe is allowed"""
+        retry_at = self.status()['retry_at']
+        return max(0.0, retry_at - time.time()) if retry_at else 0.0
+
+
+def get_breaker():
+    return CircuitBreaker(
+        settings.EVALUATOR_BREAKER_FILE,
+        settings.EVALUATOR_BREAKER_THRESHOLD,
+        settings.EVALUATOR_BREAKER_COOLDOWN
+    )
+
+
+def get_limiter():
+    return SharedLimiter(
+        settings.EVALUATOR_RATE_LIMIT_FILE,
+        settings.EVALUATOR_RATE_LIMIT_PER_MINUTE,
+        settings.EVALUATOR_RATE_LIMIT_BURST,
+        settings.EVALUATOR_RETRY_BUDGET_RATIO,
+        settings.EVALUATOR_RETRY_BUDGET_MAX
+    )
+
+
+def retry_delay(attempt, retry_after=None):
+    """Exponential backoff with full jitter, never shorter than the server's retry_after"""
+    cap = min(settings.EVALUATOR_RETRY_MAX_DELAY, settings.EVALUATOR_RETRY_BASE_DELAY * (2 ** attempt))
+    return max(random.uniform(0, cap), retry_after or 0)
+
+
+def call_evaluator(backend, prompt, generation_config=None):
+    """backend.generate() behind the circuit breaker and shared rate limit, retrying transient errors"""
+    breaker = get_breaker()
+    limiter = get_limiter()
+    attempt = 0
+
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(
+                'The AI evaluator is unavailable after repeated failures; try again shortly.',
+                retry_at=breaker.status()['retry_at']
+            )
+
+        limiter.acquire(settings.EVALUATOR_RATE_LIMIT_TIMEOUT)
+        try:
+            response = backend.generate(prompt, generation_config=generation_config)
+        except TransientBackendError as e:
+            breaker.record_failure()
+            if attempt >= settings.EVALUATOR_MAX_RETRIES:
+                raise TransientBackendError(f'{e} (gave up after {attempt + 1} attempts)')
+            if not limiter.spend_retry():
+                raise TransientBackendError(f'{e} (retry budget exhausted)')
+
+            delay = retry_delay(attempt, e.retry_after)
+            print(f"Evaluator call failed ({e}), retry {attempt + 1} in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        breaker.record_success()
+        return response
@@ -0,0 +1,759 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.template.loader import render_to_string
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from .models import EvaluationCriteria, ProjectEvaluation, CriterionScore, EvaluationJob
+from .extraction import get_report_text, ExtractionError
+from .prompts import pack_report, group_sections, estimate_tokens
+from projects.models import Project, TeamMember
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from .backends import get_backend
+from .ratelimit import call_evaluator, CircuitOpenError
+from .emails import results_ready_email
+from notifications.models import OutboundEmail
+import hashlib
+import json
+import threading
+import time
+
+
+GENERATION_CONFIG = {'response_mime_type': 'application/json'}
+
+
+class EvaluationError(Exception):
+    """Raised when an AI evaluation cannot be completed"""
+
+
+# ============= AI EVALUATION PIPELINE =============
+
+def criteria_snapshot(criteria_list):
+    """JSON snapshot of the criteria an evaluation was made against"""
+    return json.dumps([{
+        'name': c.criteria_name,
+        'description': c.criteria_description,
+        'max_marks': int(c.max_marks)
+    } for c in criteria_list])
+
+
+RESPONSE_FORMAT = """{
+  "summary": "2-3 sentences summarizing the overall project quality",
+  "criteria": [
+    {"name": "<criterion name>", "score": <marks awarded>, "max_marks": <criterion max marks>, "feedback": ["<brief point>", "<brief point>"]}
+  ],
+  "strengths": ["<key strength>", "<key strength>"],
+  "improvements": ["<improvement suggestion>", "<improvement suggestion>"]
+}"""
+
+
+def build_evaluation_prompt(project, criteria_list, pdf_text, from_summaries=False):
+    """Build the evaluator prompt for a single project"""
+    criteria_text = "\n".join([
+        f"- {c.criteria_name} ({c.max_marks} marks): {c.criteria_description}"
+        for c in criteria_list
+    ])
+
+    total_marks = sum(c.max_marks for c in criteria_list)
+
+    if from_summaries:
+        report_heading = 'PROJECT REPORT (notes summarizing each part of a long report)'
+    else:
+        report_heading = 'PROJECT REPORT (sections most relevant to the criteria; [...] marks omitted text)'
+
+    return f"""You are an expert project evaluator. Evaluate this project against each criterion.
+
+PROJECT DETAILS:
+- Project Name: {project.project_name}
+- GitHub Link: {project.github_link}
+- Team: {project.team.team_name}
+
+{report_heading}:
+{pack_report(pdf_text, criteria_list)}
+
+EVALUATION CRITERIA:
+{criteria_text}
+Total Available: {total_marks} marks
+
+INSTRUCTIONS:
+1. Score every criterion out of its own maximum marks
+2. Give 1-3 brief feedback points per criterion (one line each)
+3. List the key strengths and areas for improvement
+4. Use the exact criterion names given above
+
+Respond with ONLY a JSON object in exactly this format:
+{RESPONSE_FORMAT}
+"""
+
+
+def _string_list(value):
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def load_ai_json(ai_response):
+    """Decode the evaluator's JSON object response"""
+    text = ai_response.strip()
+    if text.startswith('```'):
+        # Tolerate a fenced ```json block
+        text = text.strip('`')
+        if text.lower().startswith('json'):
+            text = text[4:]
+
+    try:
+        data = json.loads(text)
+    except ValueError:
+        raise EvaluationError('AI response was not valid JSON.')
+
+    if not isinstance(data, dict):
+        raise EvaluationError('AI response was not a JSON object.')
+
+    return data
+
+
+def parse_ai_result(ai_response, criteria_list):
+    """Validate the evaluator's JSON response into a normalized result document"""
+    return normalize_ai_result(load_ai_json(ai_response), criteria_list)
+
+
+def normalize_ai_result(data, criteria_list):
+    """Check a decoded result against the criteria and compute totals"""
+    returned = [c for c in data.get('criteria') or [] if isinstance(c, dict)]
+    by_name = {str(c.get('name', '')).strip().lower(): c for c in returned}
+
+    # Match by name first, so a positional fallback never takes an item another criterion named
+    matched = [by_name.get(criterion.criteria_name.strip().lower()) for criterion in criteria_list]
+    claimed = {id(item) for item in matched if item is not None}
+
+    criteria = []
+    for index, criterion in enumerate(criteria_list):
+        item = matched[index]
+        if item is None and index < len(returned) and id(returned[index]) not in claimed:
+            item = returned[index]
+            claimed.add(id(item))
+        if item is None:
+            raise EvaluationError(f'AI response has no score for "{criterion.criteria_name}".')
+
+        try:
+            score = float(item.get('score'))
+        except (TypeError, ValueError):
+            raise EvaluationError(f'AI response has an invalid score for "{criterion.criteria_name}".')
+
+        criteria.append({
+            'name': criterion.criteria_name,
+            'score': round(min(max(score, 0.0), float(criterion.max_marks)), 2),
+            'max_marks': int(criterion.max_marks),
+            'feedback': _string_list(item.get('feedback')),
+        })
+
+    total_score = sum(c['score'] for c in criteria)
+    total_marks = sum(c['max_marks'] for c in criteria)
+
+    return {
+        'summary': str(data.get('summary') or '').strip(),
+        'criteria': criteria,
+        'strengths': _string_list(data.get('strengths')),
+        'improvements': _string_list(data.get('improvements')),
+        'total_score': round(total_score, 2),
+        'total_marks': total_marks,
+        'percentage': round((total_score / total_marks) * 100, 2) if total_marks > 0 else 0.0,
+    }
+
+
+BATCH_RESPONSE_FORMAT = """{
+  "projects": [
+    {
+      "project_id": "<project id, e.g. P1>",
+      "summary": "2-3 sentences summarizing the overall project quality",
+      "criteria": [
+        {"name": "<criterion name>", "score": <marks awarded>, "max_marks": <criterion max marks>, "feedback": ["<brief point>", "<brief point>"]}
+      ],
+      "strengths": ["<key strength>", "<key strength>"],
+      "improvements": ["<improvement suggestion>", "<improvement suggestion>"]
+    }
+  ]
+}"""
+
+
+def build_batch_prompt(projects, criteria_list, report_texts):
+    """Build one evaluator prompt for several projects scored against the same criteria
+
+    Projects are labelled P1, P2, ... in order; report_texts is parallel to projects.
+    """
+    criteria_text = "\n".join([
+        f"- {c.criteria_name} ({c.max_marks} marks): {c.criteria_description}"
+        for c in criteria_list
+    ])
+
+    total_marks = sum(c.max_marks for c in criteria_list)
+
+    project_sections = "\n\n".join([
+        f"""=== PROJECT P{index} ===
+- Project Name: {project.project_name}
+- GitHub Link: {project.github_link}
+- Team: {project.team.team_name}
+
+PROJECT REPORT (sections most relevant to the criteria; [...] marks omitted text):
+{pack_report(report_text, criteria_list, settings.EVALUATION_BATCH_PROJECT_TOKEN_BUDGET)}"""
+        for index, (project, report_text) in enumerate(zip(projects, report_texts), start=1)
+    ])
+
+    return f"""You are an expert project evaluator. Evaluate each of the {len(projects)} projects below
+independently against the same criteria. Do not compare the projects with each other.
+
+EVALUATION CRITERIA:
+{criteria_text}
+Total Available: {total_marks} marks
+
+{project_sections}
+
+INSTRUCTIONS:
+1. Score every criterion of every project out of its own maximum marks
+2. Give 1-3 brief feedback points per criterion (one line each)
+3. List the key strengths and areas for improvement of each project
+4. Use the exact criterion names given above
+5. Return exactly one entry per project, with its project_id (P1, P2, ...)
+
+Respond with ONLY a JSON object in exactly this format:
+{BATCH_RESPONSE_FORMAT}
+"""
+
+
+def parse_batch_result(ai_response, project_count, criteria_list):
+    """Validate a batched response into one normalized result per project, in prompt order"""
+    data = load_ai_json(ai_response)
+
+    by_id = {}
+    for item in data.get('projects') or []:
+        if isinstance(item, dict):
+            by_id[str(item.get('project_id', '')).strip().upper()] = item
+
+    results = []
+    for index in range(1, project_count + 1):
+        item = by_id.get(f'P{index}')
+        if item is None:
+            raise EvaluationError(f'Batched AI response has no result for project P{index}.')
+        results.append(normalize_ai_result(item, criteria_list))
+    return results
+
+
+RESULT_FRAGMENTS = ('faculty_evaluation_result', 'student_evaluation_result')
+
+
+def invalidate_result_cache(evaluation):
+    """Drop the cached result fragments of an evaluation before it is changed"""
+    if evaluation.pk is None or evaluation.updated_at is None:
+        return
+    vary_on = [evaluation.id, evaluation.updated_at.timestamp()]
+    caches['results'].delete_many([
+        make_template_fragment_key(fragment, vary_on) for fragment in RESULT_FRAGMENTS
+    ])
+
+
+def prompt_fingerprint(model_name, prompt, generation_config):
+    """Cache key identifying an exact evaluator request"""
+    payload = json.dumps([model_name, prompt, generation_config], sort_keys=True)
+    return 'llm:' + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _count_call(stage_stats, prompt, response, cached):
+    if stage_stats is None:
+        return
+    stage_stats['calls'] = stage_stats.get('calls', 0) + 1
+    stage_stats['cache_hits'] = stage_stats.get('cache_hits', 0) + (1 if cached else 0)
+    stage_stats['input_tokens'] = stage_stats.get('input_tokens', 0) + estimate_tokens(prompt)
+    stage_stats['output_tokens'] = stage_stats.get('output_tokens', 0) + estimate_tokens(response)
+
+
+def generate_ai_response(prompt, force_refresh=False, parse=None, generation_config=None, stage_stats=None):
+    """Call the evaluator backend, reusing the cached response for an identical request
+
+    With parse given, returns parse(response) and only caches responses that parse.
+    With stage_stats given, adds the call's estimated token counts to it.
+    """
+    if generation_config is None:
+        generation_config = GENERATION_CONFIG
+
+    backend = get_backend()
+    cache = caches['llm_responses']
+    key = prompt_fingerprint(backend.model_name, prompt, generation_config)
+
+    if not force_refresh:
+        cached = cache.get(key)
+        if cached is not None:
+            _count_call(stage_stats, prompt, cached, cached=True)
+            return parse(cached) if parse else cached
+
+    ai_response = call_evaluator(backend, prompt, generation_config)
+    _count_call(stage_stats, prompt, ai_response, cached=False)
+    result = parse(ai_response) if parse else ai_response
+
+    cache.set(key, ai_response)
+    return result
+
+
+# ============= LONG REPORTS (MAP-REDUCE) =============
+
+def build_summary_prompt(project, criteria_list, chunk_text, part, parts):
+    """Prompt asking for evidence-focused notes on one part of a long report"""
+    criteria_text = "\n".join([
+        f"* {c.criteria_name}: {c.criteria_description}"
+        for c in criteria_list
+    ])
+
+    return f"""You are helping evaluate a long project report. Below is part {part} of {parts} of the report for "{project.project_name}".
+
+Write concise notes (at most {settings.EVALUATION_SUMMARY_WORDS} words) on what this part shows, keeping the concrete evidence
+(methods, implementation details, results, numbers, limitations) that bears on these criteria:
+{criteria_text}
+
+Do not score anything. Plain text only.
+
+REPORT PART {part} OF {parts}:
+{chunk_text}
+"""
+
+
+def summarize_report(project, criteria_list, report_text, force_refresh=False, stats=None):
+    """Map stage: summarize chunks of a long report in parallel, returning the joined summaries"""
+    chunks = group_sections(report_text, settings.EVALUATION_SUMMARY_CHUNK_TOKENS)
+    parts = len(chunks)
+
+    def summarize(index):
+        call_stats = {}
+        prompt = build_summary_prompt(project, criteria_list, chunks[index], index + 1, parts)
+        summary = generate_ai_response(
+            prompt,
+            force_refresh=force_refresh,
+            generation_config={},
+            stage_stats=call_stats
+        )
+        return summary.strip(), call_stats
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, settings.EVALUATION_SUMMARY_CONCURRENCY)) as executor:
+        results = list(executor.map(summarize, range(parts)))
+
+    if stats is not None:
+        stage = {'chunks': parts}
+        for _, call_stats in results:
+            for key, value in call_stats.items():
+                stage[key] = stage.get(key, 0) + value
+        stage['seconds'] = round(time.monotonic() - started, 2)
+        stats['summarize'] = stage
+
+    return "\n\n".join(
+        f"[Part {index + 1} of {parts}]\n{summary}"
+        for index, (summary, _) in enumerate(results)
+    )
+
+
+def is_long_report(report_text):
+    threshold = settings.EVALUATION_LONG_REPORT_TOKENS
+    return bool(threshold) and estimate_tokens(report_text) > threshold
+
+
+def run_ai_evaluation(project, faculty, force_refresh=False, stats=None):
+    """Extract the report, call the AI evaluator and save the AI part of the evaluation
+
+    Reports longer than EVALUATION_LONG_REPORT_TOKENS are summarized in parallel first and
+    scored from the summaries. With stats given, per-stage latency and token counts are
+    recorded in it.
+    """
+    criteria_list = list(EvaluationCriteria.objects.filter(faculty=faculty))
+
+    if not criteria_list:
+        raise EvaluationError('Please create evaluation criteria first.')
+
+    backend = get_backend()
+    if not backend.is_configured():
+        raise EvaluationError(backend.not_configured_message)
+
+    if stats is None:
+        stats = {}
+
+    # Extract PDF text (parsed once per unique report file)
+    pdf_text = get_report_text(project)
+
+    if is_long_report(pdf_text):
+        summaries = summarize_report(project, criteria_list, pdf_text, force_refresh, stats)
+        prompt = build_evaluation_prompt(project, criteria_list, summaries, from_summaries=True)
+    else:
+        prompt = build_evaluation_prompt(project, criteria_list, pdf_text)
+
+    # Call the AI evaluator
+    score_stats = {}
+    started = time.monotonic()
+    result = generate_ai_response(
+        prompt,
+        force_refresh=force_refresh,
+        parse=lambda response: parse_ai_result(response, criteria_list),
+        stage_stats=score_stats
+    )
+    score_stats['seconds'] = round(time.monotonic() - started, 2)
+    stats['score'] = score_stats
+
+    print(f"AI evaluation stats for {project.project_name}: {json.dumps(stats)}")
+    return save_ai_result(project, faculty, criteria_list, result)
+
+
+def save_criterion_scores(evaluation, criteria_list, ai_scores=None, faculty_scores=None):
+    """Store per-criterion scores, keyed by criterion id, as CriterionScore rows
+
+    Only the scores passed in are written, so saving faculty scores keeps the AI ones.
+    """
+    for criterion in criteria_list:
+        defaults = {'criterion': criterion, 'max_marks': int(criterion.max_marks)}
+        if ai_scores and criterion.id in ai_scores:
+            defaults['ai_score'] = ai_scores[criterion.id]
+        if faculty_scores and criterion.id in faculty_scores:
+            defaults['faculty_score'] = faculty_scores[criterion.id]
+        if len(defaults) == 2:
+            continue
+
+        CriterionScore.objects.update_or_create(
+            evaluation=evaluation,
+            criteria_name=criterion.criteria_name,
+            defaults=defaults
+        )
+
+
+def save_ai_result(project, faculty, criteria_list, result):
+    """Store a parsed AI result on the project's evaluation"""
+    # Get or create evaluation
+    evaluation, created = ProjectEvaluation.objects.get_or_create(
+        project=project,
+        defaults={
+            'faculty': faculty,
+            'evaluation_criteria': criteria_snapshot(criteria_list)
+        }
+    )
+
+    invalidate_result_cache(evaluation)
+
+    # Save as float - simple and clean
+    evaluation.ai_marks = round(min(result['percentage'], 100.0), 2)
+    evaluation.ai_result = json.dumps(result)
+    evaluation.ai_feedback = render_to_string('evaluations/ai_feedback.html', {'result': result})
+    evaluation.ai_evaluated_at = timezone.now()
+    # Only the AI fields, so a concurrent faculty save or notification isn't overwritten
+    evaluation.save(update_fields=['ai_marks', 'ai_result', 'ai_feedback', 'ai_evaluated_at', 'updated_at'])
+
+    # parse_ai_result returns the criteria in criteria_list order
+    save_criterion_scores(evaluation, criteria_list, ai_scores={
+        criterion.id: item['score'] for criterion, item in zip(criteria_list, result['criteria'])
+    })
+
+    # Update project status if fully evaluated
+    if evaluation.is_fully_evaluated:
+        project.status = 'evaluated'
+        project.save()
+        notify_results_ready(evaluation)
+
+    return evaluation
+
+
+def notify_results_ready(evaluation):
+    """Queue one results email per team member, the first time an evaluation is complete
+
+    Returns the number of emails queued.
+    """
+    if not evaluation.is_fully_evaluated:
+        return 0
+
+    # Conditional update so concurrent saves only notify once
+    now = timezone.now()
+    claimed = ProjectEvaluation.objects.filter(
+        id=evaluation.id,
+        ai_marks__isnull=False,
+        faculty_marks__isnull=False,
+        results_notified_at__isnull=True
+    ).update(results_notified_at=now)
+    if not claimed:
+        return 0
+    evaluation.results_notified_at = now
+
+    members = TeamMember.objects.filter(team_id=evaluation.project.team_id).select_related('student', 'student__user')
+    emails = [results_ready_email(evaluation, member.student) for member in members]
+    OutboundEmail.objects.bulk_create(emails)
+
+    print(f"Queued {len(emails)} result notification(s) for {evaluation.project.project_name}")
+    return len(emails)
+
+
+# ============= BATCHED EVALUATION =============
+
+def run_batch_evaluation(projects, faculty, force_refresh=False, stats=None, saved=None):
+    """Evaluate several projects of one faculty with a single evaluator call
+
+    Returns {project id: evaluation}. Long and unreadable reports are left out for the
+    caller to evaluate on their own. Raises if the batched response can't be used.
+    Evaluations are also added to the saved dict as they are stored, so a caller can
+    tell which projects were already saved when saving a later one raises.
+    """
+    if saved is None:
+        saved = {}
+
+    criteria_list = list(EvaluationCriteria.objects.filter(faculty=faculty))
+
+    if not criteria_list:
+        raise EvaluationError('Please create evaluation criteria first.')
+
+    backend = get_backend()
+    if not backend.is_configured():
+        raise EvaluationError(backend.not_configured_message)
+
+    batch = []
+    report_texts = []
+    for project in projects:
+        try:
+            report_text = get_report_text(project)
+        except (FileNotFoundError, ExtractionError):
+            continue  # Evaluated on its own, where the job records the error
+        if not is_long_report(report_text):
+            batch.append(project)
+            report_texts.append(report_text)
+
+    if not batch:
+        return saved
+
+    prompt = build_batch_prompt(batch, criteria_list, report_texts)
+
+    batch_stats = {'projects': len(batch)}
+    started = time.monotonic()
+    results = generate_ai_response(
+        prompt,
+        force_refresh=force_refresh,
+        parse=lambda response: parse_batch_result(response, len(batch), criteria_list),
+        stage_stats=batch_stats
+    )
+    batch_stats['seconds'] = round(time.monotonic() - started, 2)
+    if stats is not None:
+        stats['batch'] = batch_stats
+
+    for project, result in zip(batch, results):
+        saved[project.id] = save_ai_result(project, faculty, criteria_list, result)
+    return saved
+
+
+# ============= EVALUATION JOB QUEUE =============
+
+def enqueue_evaluation(project, faculty, force_refresh=False):
+    """Queue an AI evaluation, reusing a job that is already pending
+
+    force_refresh is merged into a job that is still queued. A job that is already
+    running keeps its setting, which the caller can see on job.force_refresh.
+    """
+    job = EvaluationJob.objects.filter(
+        project=project,
+        status__in=['queued', 'running']
+    ).first()
+    if job:
+        if force_refresh and not job.force_refresh:
+            # Conditional update, so a worker claiming the job meanwhile is not overridden
+            if EvaluationJob.objects.filter(id=job.id, status='queued').update(force_refresh=True):
+                job.force_refresh = True
+        return job, False
+
+    job = EvaluationJob.objects.create(project=project, faculty=faculty, force_refresh=force_refresh)
+    return job, True
+
+
+def enqueue_pending_evaluations(faculty, force=False):
+    """Queue AI evaluations for submitted projects of a faculty that have no AI marks yet
+
+    With force=True projects that were already evaluated are queued again.
+    """
+    projects = Project.objects.filter(team__faculty=faculty, status='submitted')
+    if not force:
+        projects = projects.filter(evaluation__ai_marks__isnull=True)
+    active_ids = set(EvaluationJob.objects.filter(
+        project__in=projects,
+        status__in=['queued', 'running']
+    ).values_list('project_id', flat=True))
+
+    jobs = [
+        EvaluationJob(project=project, faculty=faculty)
+        for project in projects if project.id not in active_ids
+    ]
+    EvaluationJob.objects.bulk_create(jobs)
+    return len(jobs)
+
+
+def start_job(project, faculty, force_refresh=False):
+    """Create a job that is already running, or None if one is active"""
+    if EvaluationJob.objects.filter(project=project, status__in=['queued', 'running']).exists():
+        return None
+
+    return EvaluationJob.objects.create(
+        project=project,
+        faculty=faculty,
+        status='running',
+        started_at=timezone.now(),
+        force_refresh=force_refresh
+    )
+
+
+def claim_next_job():
+    """Atomically move the oldest queued job to running, or return None"""
+    while True:
+        job = EvaluationJob.objects.filter(status='queued').order_by('created_at').first()
+        if job is None:
+            return None
+
+        # Conditional update so two workers never run the same job
+        claimed = EvaluationJob.objects.filter(id=job.id, status='queued').update(
+            status='running',
+            started_at=timezone.now()
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def claim_job_batch(size):
+    """Claim the oldest queued job plus up to size - 1 more queued jobs of the same faculty"""
+    job = claim_next_job()
+    if job is None:
+        return []
+
+    jobs = [job]
+    if size > 1:
+        candidates = EvaluationJob.objects.filter(
+            status='queued',
+            faculty_id=job.faculty_id
+        ).order_by('created_at').values_list('id', flat=True)[:size - 1]
+
+        for job_id in list(candidates):
+            claimed = EvaluationJob.objects.filter(id=job_id, status='queued').update(
+                status='running',
+                started_at=timezone.now()
+            )
+            if claimed:
+                jobs.append(EvaluationJob.objects.get(id=job_id))
+
+    return jobs
+
+
+def requeue_stale_jobs(max_age_seconds):
+    """Put jobs back in the queue whose worker died mid-run"""
+    cutoff = timezone.now() - timedelta(seconds=max_age_seconds)
+    stale = Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    return EvaluationJob.objects.filter(stale, status='running').update(
+        status='queued',
+        started_at=None,
+        heartbeat_at=None
+    )
+
+
+@contextmanager
+def job_heartbeat(jobs):
+    """Refresh heartbeat_at of running jobs while the block runs
+
+    Rate limiting, retries and long reports can keep a job busy for longer than
+    requeue_stale_jobs' threshold, so the worker shows it is still alive.
+    """
+    ids = [job.id for job in jobs]
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(settings.EVALUATION_JOB_HEARTBEAT):
+                EvaluationJob.objects.filter(id__in=ids, status='running').update(heartbeat_at=timezone.now())
+        finally:
+            # The thread has its own DB connection
+            connection.close()
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def defer_job(job):
+    """Put a claimed job back in the queue untouched, for when the evaluator is down"""
+    job.status = 'queued'
+    job.started_at = None
+    job.heartbeat_at = None
+    job.save(update_fields=['status', 'started_at', 'heartbeat_at'])
+    print(f"AI Job {job.id}: deferred, evaluator circuit breaker is open")
+    return job
+
+
+def process_job(job):
+    """Run a claimed job and record the outcome on it"""
+    stats = {}
+    try:
+        evaluation = run_ai_evaluation(job.project, job.faculty, force_refresh=job.force_refresh, stats=stats)
+        job.status = 'done'
+        job.error_message = None
+        print(f"AI Job {job.id}: done, score {evaluation.ai_marks}/100")
+    except CircuitOpenError:
+        return defer_job(job)
+    except FileNotFoundError:
+        job.status = 'failed'
+        job.error_message = 'Project report file not found. Please re-upload the report.'
+    except ExtractionError as e:
+        job.status = 'failed'
+        job.error_message = f'Could not read the project report: {e}'
+    except Exception as e:
+        job.status = 'failed'
+        job.error_message = f'AI evaluation failed: {str(e)}'
+        print(f"AI Evaluation Error: {e}")
+        import traceback
+        traceback.print_exc()
+
+    job.stats = json.dumps(stats) if stats else None
+    job.finished_at = timezone.now()
+    job.save()
+    return job
+
+
+def process_job_batch(jobs):
+    """Run claimed jobs of one faculty as one batched call, falling back to a call per job"""
+    with job_heartbeat(jobs):
+        return _process_job_batch(jobs)
+
+
+def _process_job_batch(jobs):
+    if len(jobs) == 1:
+        return [process_job(jobs[0])]
+
+    stats = {}
+    evaluations = {}
+    try:
+        run_batch_evaluation(
+            [job.project for job in jobs],
+            jobs[0].faculty,
+            force_refresh=any(job.force_refresh for job in jobs),
+            stats=stats,
+            saved=evaluations
+        )
+    except CircuitOpenError:
+        return [defer_job(job) for job in jobs]
+    except Exception as e:
+        # Results saved before the failure are kept, only the rest are evaluated again
+        print(f"Batched evaluation of {len(jobs)} projects failed after saving {len(evaluations)}, "
+              f"evaluating the rest one by one: {e}")
+
+    for job in jobs:
+        if job.project_id not in evaluations:
+            # Long or unreadable report, or the batch failed before it was saved
+            process_job(job)
+            continue
+
+        job.status = 'done'
+        job.error_message = None
+        job.stats = json.dumps(stats)
+        job.finished_at = timezone.now()
+        job.save()
+        print(f"AI Job {job.id}: done in batch of {len(jobs)}, score {evaluations[job.project_id].ai_marks}/100")
+
+    return jobs
@@ -1,3 +1,405 @@
-from django.test import TestCase
+from django.template import Context, Template
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from accounts.models import User, Faculty
+from projects.models import ProjectTeam, Project
+from .models import EvaluationCriteria, EvaluationJob, ProjectEvaluation
+from .services import (
+    enqueue_evaluation, enqueue_pending_evaluations, claim_next_job, process_job, process_job_batch,
+    requeue_stale_jobs, parse_ai_result, save_ai_result, EvaluationError
+)
+from .ratelimit import CircuitBreaker, SharedLimiter, RateLimitTimeout
+from .extraction import ExtractionError, ExtractionTimeout, run_isolated
+from .export import stream_csv
+from .prompts import CHARS_PER_TOKEN, CHUNK_TOKENS, estimate_tokens, split_sections, pack_report
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest import mock
+import csv
+import json
+import os
+import tempfile
+import time
 
-# Create your tests here.
+
+FAKE_EVALUATOR = {
+    'EVALUATOR_BACKEND': 'evaluations.backends.FakeBackend',
+    'EVALUATOR_FAKE_LATENCY': 0,
+    'EVALUATOR_FAKE_LATENCY_JITTER': 0,
+    'EVALUATOR_FAKE_FAILURE_RATE': 0,
+    'EVALUATOR_RATE_LIMIT_PER_MINUTE': 0,
+    'EVALUATOR_BREAKER_THRESHOLD': 0,
+    'PDF_EXTRACTION_PROCESSES': 0,
+}
+
+
+@override_settings(**FAKE_EVALUATOR)
+class ProcessJobTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(email='faculty@example.com', password='pass1234', user_type='faculty')
+        self.faculty = Faculty.objects.create(
+            user=user, faculty_id='FAC001', full_name='Test Faculty',
+            department='CSE', phone='9999999999', designation='Professor'
+        )
+        EvaluationCriteria.objects.create(
+            faculty=self.faculty, criteria_name='Documentation',
+            criteria_description='Quality of the report', max_marks=100
+        )
+        team = ProjectTeam.objects.create(team_name='Team 1', faculty=self.faculty)
+        self.project = Project.objects.create(
+            team=team, project_name='Project 1', github_link='https://github.com/example/project',
+            project_report='project_reports/missing.pdf', status='submitted'
+        )
+
+    def test_missing_report_fails_job_without_marks(self):
+        enqueue_evaluation(self.project, self.faculty)
+        job = process_job(claim_next_job())
+
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.error_message, 'Project report file not found. Please re-upload the report.')
+        self.assertFalse(ProjectEvaluation.objects.filter(project=self.project, ai_marks__isnull=False).exists())
+        self.assertFalse(EvaluationJob.objects.filter(status='done').exists())
+
+    def test_stale_jobs_are_requeued_unless_heartbeat_is_recent(self):
+        enqueue_evaluation(self.project, self.faculty)
+        job = claim_next_job()
+        long_ago = timezone.now() - timedelta(minutes=30)
+
+        EvaluationJob.objects.filter(id=job.id).update(started_at=long_ago, heartbeat_at=timezone.now())
+        self.assertEqual(requeue_stale_jobs(600), 0)
+
+        EvaluationJob.objects.filter(id=job.id).update(heartbeat_at=long_ago)
+        self.assertEqual(requeue_stale_jobs(600), 1)
+        self.assertEqual(EvaluationJob.objects.get(id=job.id).status, 'queued')
+
+    def test_force_refresh_is_merged_into_queued_job(self):
+        job, created = enqueue_evaluation(self.project, self.faculty)
+        merged, created = enqueue_evaluation(self.project, self.faculty, force_refresh=True)
+
+        self.assertFalse(created)
+        self.assertEqual(merged.id, job.id)
+        self.assertTrue(merged.force_refresh)
+        self.assertTrue(EvaluationJob.objects.get(id=job.id).force_refresh)
+
+    def test_force_refresh_is_not_applied_to_running_job(self):
+        enqueue_evaluation(self.project, self.faculty)
+        running = claim_next_job()
+        job, created = enqueue_evaluation(self.project, self.faculty, force_refresh=True)
+
+        self.assertFalse(created)
+        self.assertEqual(job.id, running.id)
+        self.assertFalse(job.force_refresh)
+        self.assertFalse(EvaluationJob.objects.get(id=job.id).force_refresh)
+
+    def test_evaluated_projects_are_not_queued_again(self):
+        self.assertEqual(enqueue_pending_evaluations(self.faculty), 1)
+        EvaluationJob.objects.update(status='done')
+        ProjectEvaluation.objects.create(
+            project=self.project, faculty=self.faculty, ai_marks=72, evaluation_criteria='[]'
+        )
+
+        self.assertEqual(enqueue_pending_evaluations(self.faculty), 0)
+        out = StringIO()
+        call_command('evaluate_pending', stdout=out)
+        self.assertIn('No submitted projects waiting for AI evaluation.', out.getvalue())
+        self.assertFalse(EvaluationJob.objects.exclude(status='done').exists())
+
+        self.assertEqual(enqueue_pending_evaluations(self.faculty, force=True), 1)
+
+    def test_batch_failure_only_reevaluates_unsaved_projects(self):
+        second = Project.objects.create(
+            team=ProjectTeam.objects.create(team_name='Team 2', faculty=self.faculty), project_name='Project 2', github_link='https://github.com/example/second',
+            project_report='project_reports/missing.pdf', status='submitted'
+        )
+        jobs = [enqueue_evaluation(project, self.faculty)[0] for project in (self.project, second)]
+        EvaluationJob.objects.update(status='running', started_at=timezone.now())
+        saves = []
+
+        def save_then_fail(project, *args):
+            saves.append(project.id)
+            if project.id == second.id:
+                raise RuntimeError('connection lost')
+            return save_ai_result(project, *args)
+
+        with mock.patch('evaluations.services.get_report_text', return_value='A short report.'), \
+                mock.patch('evaluations.services.save_ai_result', side_effect=save_then_fail), \
+                mock.patch('evaluations.services.process_job') as fallback:
+            process_job_batch(jobs)
+
+        self.assertEqual(saves, [self.project.id, second.id])
+        self.assertEqual([call.args[0].project_id for call in fallback.call_args_list], [second.id])
+        self.assertEqual(EvaluationJob.objects.get(id=jobs[0].id).status, 'done')
+        self.assertIsNotNone(ProjectEvaluation.objects.get(project=self.project).ai_marks)
+
+    def test_status_endpoint_returns_job_state_and_card(self):
+        self.client.login(email='faculty@example.com', password='pass1234')
+        url = reverse('ai_evaluation_status', args=[self.project.id])
+        enqueue_evaluation(self.project, self.faculty)
+
+        data = self.client.get(url).json()
+        self.assertEqual(data['status'], 'queued')
+        self.assertTrue(data['active'])
+        self.assertIn('Refresh status', data['html'])
+
+        process_job(claim_next_job())
+        data = self.client.get(url).json()
+        self.assertEqual(data['status'], 'failed')
+        self.assertFalse(data['active'])
+        self.assertIn('Project report file not found', data['html'])
+        self.assertNotIn('Refresh status', data['html'])
+
+
+class PackReportTests(SimpleTestCase):
+    criteria = [
+        EvaluationCriteria(criteria_name='Testing', criteria_description='Unit tests and coverage', max_marks=50),
+        EvaluationCriteria(criteria_name='Design', criteria_description='Architecture of the system', max_marks=50),
+    ]
+
+    def test_long_line_is_split_into_chunks(self):
+        text = ' '.join(['lorem ipsum dolor'] * 1500)  # One 25k character line, as PyPDF2 often gives
+        chunks = split_sections(text)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(chunk['tokens'] <= CHUNK_TOKENS for chunk in chunks))
+        self.assertEqual(' '.join(chunk['text'] for chunk in chunks), text)
+
+    def test_word_longer_than_a_chunk_is_cut(self):
+        chunks = split_sections('x' * (CHUNK_TOKENS * CHARS_PER_TOKEN * 2 + 10))
+        self.assertEqual(len(chunks), 3)
+
+    def test_headings_are_kept_with_their_chunks(self):
+        chunks = split_sections('1. Introduction\nWe built a tool.\nTESTING\nWe wrote unit tests.')
+        self.assertEqual([(c['heading'], c['text']) for c in chunks], [
+            ('1. Introduction', 'We built a tool.'),
+            ('TESTING', 'We wrote unit tests.'),
+        ])
+
+    def test_short_report_is_unchanged(self):
+        self.assertEqual(pack_report('A short report.', self.criteria, token_budget=100), 'A short report.')
+
+    def test_single_long_line_is_packed_within_budget(self):
+        text = ' '.join(['the architecture design uses unit tests for coverage'] * 500)
+        packed = pack_report(text, self.criteria, token_budget=1500)
+
+        self.assertNotEqual(packed.replace('[...]', '').strip(), '')
+        self.assertLessEqual(estimate_tokens(packed), 1500 + 10)
+
+    def test_budget_smaller_than_any_chunk_falls_back_to_prefix(self):
+        text = 'Testing design. ' * 2000
+        self.assertEqual(pack_report(text, self.criteria, token_budget=50), text[:50 * CHARS_PER_TOKEN])
+
+    def test_relevant_sections_are_preferred(self):
+        filler = '\n'.join(['Background history of the college and its many buildings.'] * 40)
+        text = f'ABSTRACT\nA summary.\nHISTORY\n{filler}\nTESTING\nUnit tests give full coverage.\nHISTORY AGAIN\n{filler}'
+        packed = pack_report(text, self.criteria, token_budget=400)
+
+        self.assertIn('Unit tests give full coverage.', packed)
+        self.assertIn('A summary.', packed)
+        self.assertIn('[...]', packed)
+
+
+class ParseAIResultTests(SimpleTestCase):
+    criteria = [
+        EvaluationCriteria(criteria_name='Documentation', criteria_description='Report quality', max_marks=40),
+        EvaluationCriteria(criteria_name='Implementation', criteria_description='Code quality', max_marks=60),
+    ]
+
+    def response(self, criteria, **extra):
+        return json.dumps(dict({'summary': 'Solid work.', 'criteria': criteria}, **extra))
+
+    def test_valid_response_is_normalized(self):
+        result = parse_ai_result(self.response([
+            {'name': 'Documentation', 'score': 30, 'feedback': ['Clear']},
+            {'name': 'implementation', 'score': '45.5', 'feedback': ['Good tests', '']},
+        ], strengths=['Tests']), self.criteria)
+
+        self.assertEqual([c['score'] for c in result['criteria']], [30.0, 45.5])
+        self.assertEqual(result['criteria'][1]['feedback'], ['Good tests'])
+        self.assertEqual(result['total_score'], 75.5)
+        self.assertEqual(result['total_marks'], 100)
+        self.assertEqual(result['percentage'], 75.5)
+        self.assertEqual(result['strengths'], ['Tests'])
+
+    def test_fenced_json_is_accepted(self):
+        response = '```json\n' + self.response([
+            {'name': 'Documentation', 'score': 20}, {'name': 'Implementation', 'score': 30},
+        ]) + '\n```'
+        self.assertEqual(parse_ai_result(response, self.criteria)['total_score'], 50.0)
+
+    def test_missing_criterion_is_rejected(self):
+        with self.assertRaisesMessage(EvaluationError, 'no score for "Implementation"'):
+            parse_ai_result(self.response([{'name': 'Documentation', 'score': 20}]), self.criteria)
+
+    def test_invalid_score_is_rejected(self):
+        with self.assertRaisesMessage(EvaluationError, 'invalid score for "Documentation"'):
+            parse_ai_result(self.response([
+                {'name': 'Documentation', 'score': 'great'}, {'name': 'Implementation', 'score': 30},
+            ]), self.criteria)
+
+    def test_scores_are_clamped_to_range(self):
+        result = parse_ai_result(self.response([
+            {'name': 'Documentation', 'score': 55}, {'name': 'Implementation', 'score': -5},
+        ]), self.criteria)
+        self.assertEqual([c['score'] for c in result['criteria']], [40.0, 0.0])
+
+    def test_criteria_matched_by_position_when_names_differ(self):
+        result = parse_ai_result(self.response([
+            {'name': 'Docs', 'score': 10}, {'name': 'Code', 'score': 20},
+        ]), self.criteria)
+        self.assertEqual(
+            [(c['name'], c['score']) for c in result['criteria']],
+            [('Documentation', 10.0), ('Implementation', 20.0)]
+        )
+
+    def test_item_matched_by_name_is_not_reused_by_position(self):
+        response = self.response([{'name': 'Implementation', 'score': 50}])
+        with self.assertRaisesMessage(EvaluationError, 'no score for "Documentation"'):
+            parse_ai_result(response, self.criteria)
+
+    def test_non_json_is_rejected(self):
+        with self.assertRaisesMessage(EvaluationError, 'not valid JSON'):
+            parse_ai_result('Score: 80/100', self.criteria)
+        with self.assertRaisesMessage(EvaluationError, 'not a JSON object'):
+            parse_ai_result('[1, 2]', self.criteria)
+
+
+class AIFeedbackEscapingTests(SimpleTestCase):
+    template = Template('{{ evaluation.ai_feedback_html }}')
+
+    def test_feedback_rendered_from_ai_result_is_trusted(self):
+        evaluation = ProjectEvaluation(ai_result='{}', ai_feedback='<p>Good</p>')
+        self.assertEqual(self.template.render(Context({'evaluation': evaluation})), '<p>Good</p>')
+
+    def test_older_free_text_feedback_is_escaped(self):
+        evaluation = ProjectEvaluation(ai_feedback='<script>alert(1)</script>')
+        self.assertEqual(
+            self.template.render(Context({'evaluation': evaluation})),
+            '&lt;script&gt;alert(1)&lt;/script&gt;'
+        )
+
+
+class ExportCSVTests(SimpleTestCase):
+    def test_formula_cells_are_quoted(self):
+        name = '=HYPERLINK("http://evil.example","click")'
+        row = ['Team 1', name, '+1', '@SUM(A1)', '\tTab', '-2', 'Plain', -5.0, None]
+        header, line = csv.reader(stream_csv([row]))
+
+        self.assertEqual(line, ["Team 1", "'" + name, "'+1", "'@SUM(A1)", "'\tTab", "'-2", 'Plain', '-5.0', ''])
+
+
+class SharedStateTestCase(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'state.json')
+
+
+class CircuitBreakerTests(SharedStateTestCase):
+    def test_closed_open_half_open_closed(self):
+        breaker = CircuitBreaker(self.path, threshold=2, cooldown=60)
+        self.assertEqual(breaker.status()['state'], 'closed')
+
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.status()['state'], 'open')
+        self.assertFalse(breaker.allow())
+        self.assertGreater(breaker.seconds_until_retry(), 0)
+
+        later = breaker.status()['retry_at'] + 1
+        with mock.patch('evaluations.ratelimit.time.time', return_value=later):
+            self.assertTrue(breaker.allow())  # The probe
+            self.assertEqual(breaker.status()['state'], 'half_open')
+            self.assertFalse(breaker.allow())  # Only one probe at a time
+
+        breaker.record_success()
+        self.assertEqual(breaker.status(), {'state': 'closed', 'failures': 0, 'retry_at': None})
+        self.assertTrue(breaker.allow())
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(self.path, threshold=1, cooldown=60)
+        breaker.record_failure()
+
+        later = breaker.status()['retry_at'] + 1
+        with mock.patch('evaluations.ratelimit.time.time', return_value=later):
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+            self.assertEqual(breaker.status()['state'], 'open')
+            self.assertFalse(breaker.allow())
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker(self.path, threshold=2, cooldown=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.status()['state'], 'closed')
+
+    def test_status_does_not_write(self):
+        CircuitBreaker(self.path, threshold=2, cooldown=60).status()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_threshold_zero_disables_breaker(self):
+        breaker = CircuitBreaker(self.path, threshold=0, cooldown=60)
+        for _ in range(5):
+            breaker.record_failure()
+        self.assertTrue(breaker.allow())
+
+
+class SharedLimiterTests(SharedStateTestCase):
+    def test_burst_then_wait_for_refill(self):
+        limiter = SharedLimiter(self.path, rate_per_minute=60, burst=2, retry_ratio=0, retry_max=0)
+        limiter.acquire(timeout=0)
+        limiter.acquire(timeout=0)
+        with self.assertRaises(RateLimitTimeout):
+            limiter.acquire(timeout=0)
+
+    def test_bucket_is_shared_through_the_file(self):
+        SharedLimiter(self.path, rate_per_minute=1, burst=1, retry_ratio=0, retry_max=0).acquire(timeout=0)
+        with self.assertRaises(RateLimitTimeout):
+            SharedLimiter(self.path, rate_per_minute=1, burst=1, retry_ratio=0, retry_max=0).acquire(timeout=0)
+
+    def test_unlimited_rate_never_waits(self):
+        limiter = SharedLimiter(self.path, rate_per_minute=0, burst=1, retry_ratio=0, retry_max=0)
+        for _ in range(10):
+            limiter.acquire(timeout=0)
+
+    def test_retry_budget_is_spent_and_earned(self):
+        limiter = SharedLimiter(self.path, rate_per_minute=0, burst=1, retry_ratio=0.5, retry_max=2)
+        self.assertTrue(limiter.spend_retry())
+        self.assertTrue(limiter.spend_retry())
+        self.assertFalse(limiter.spend_retry())
+
+        limiter.acquire(timeout=0)
+        self.assertFalse(limiter.spend_retry())  # Half a retry earned
+        limiter.acquire(timeout=0)
+        self.assertTrue(limiter.spend_retry())
+
+
+def sleep_then_return(seconds, value):
+    time.sleep(seconds)
+    return value
+
+
+def raise_missing(path):
+    raise FileNotFoundError(path)
+
+
+@override_settings(PDF_EXTRACTION_PROCESSES=2, PDF_EXTRACTION_MEMORY_LIMIT_MB=0)
+class RunIsolatedTests(SimpleTestCase):
+    def test_timeout_does_not_affect_concurrent_extraction(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            stuck = executor.submit(run_isolated, sleep_then_return, (30, 'stuck'), 0.5)
+            healthy = executor.submit(run_isolated, sleep_then_return, (1.5, 'done'), 10)
+
+            with self.assertRaises(ExtractionTimeout):
+                stuck.result()
+            self.assertEqual(healthy.result(), 'done')
+
+    def test_errors_are_raised_in_the_caller(self):
+        with self.assertRaises(FileNotFoundError):
+            run_isolated(raise_missing, ('missing.pdf',), 10)
+        with self.assertRaises(ExtractionError):
+            run_isolated(sleep_then_return, ('not a number', None), 10)
@@ -11,8 +11,14 @@ urlpatterns = [
     # Project Evaluation
     path('evaluate/<uuid:project_id>/', views.evaluate_project, name='evaluate_project'),
     path('ai-evaluate/<uuid:project_id>/', views.ai_evaluate_project, name='ai_evaluate_project'),
+    path('ai-evaluate/<uuid:project_id>/status/', views.ai_evaluation_status, name='ai_evaluation_status'),
+    path('ai-evaluate-all/', views.ai_evaluate_all, name='ai_evaluate_all'),
     path('faculty-evaluate/<uuid:project_id>/', views.faculty_evaluate_project, name='faculty_evaluate_project'),
 
     # View Evaluation Results
     path('results/<uuid:project_id>/', views.evaluation_results, name='evaluation_results'),
+
+    # Analytics
+    path('analytics/', views.faculty_analytics, name='faculty_analytics'),
+    path('export/', views.export_results, name='export_results'),
 ]
\ No newline at end of file
@@ -2,19 +2,19 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
-from django.conf import settings
-from .models import EvaluationCriteria, ProjectEvaluation
-from projects.models import Project, TeamMember
-import google.generativeai as genai
+from django.http import StreamingHttpResponse, JsonResponse
+from django.template.loader import render_to_string
+from .models import EvaluationCriteria, ProjectEvaluation, EvaluationJob
+from .backends import get_backend
+from .ratelimit import get_breaker
+from . import analytics, export
+from .services import (
+    enqueue_evaluation, enqueue_pending_evaluations, invalidate_result_cache, save_criterion_scores,
+    notify_results_ready
+)
+from projects.models import Project, TeamMember, ReportText
+from datetime import datetime, timezone as dt_timezone
 import json
-import PyPDF2
-import re
-
-# Configure Gemini AI
-try:
-    genai.configure(api_key=settings.GEMINI_API_KEY)
-except:
-    pass  # Handle if API key not configured
 
 
 # ============= EVALUATION CRITERIA MANAGEMENT =============
@@ -131,19 +131,72 @@ def evaluate_project(request, project_id):
                 } for c in criteria_list])
             )
 
+    # Per-criterion AI and faculty scores for the faculty form
+    scores = {}
+    if evaluation is not None:
+        scores = {s.criterion_id: s for s in evaluation.criterion_scores.all()}
+    criterion_rows = [{'criterion': c, 'score': scores.get(c.id)} for c in criteria_list]
+
+    # Text and page count extracted at upload time
+    report_text = None
+    if project.report_sha256:
+        report_text = ReportText.objects.filter(sha256=project.report_sha256).first()
+
     context = {
         'project': project,
         'members': members,
         'criteria_list': criteria_list,
+        'criterion_rows': criterion_rows,
         'evaluation': evaluation,
+        'report_text': report_text,
+        **ai_card_context(project, evaluation),
     }
 
     return render(request, 'evaluations/evaluate_project.html', context)
 
 
+def ai_card_context(project, evaluation):
+    """Context for the AI evaluation card: latest job and evaluator state"""
+    # Latest AI job so the card can show queued/running/done state
+    latest_job = EvaluationJob.objects.filter(project=project).first()
+
+    # Circuit breaker state, so faculty know when the AI evaluator is down
+    evaluator_status = get_breaker().status()
+    if evaluator_status['retry_at']:
+        evaluator_status['retry_at'] = datetime.fromtimestamp(evaluator_status['retry_at'], tz=dt_timezone.utc)
+
+    return {
+        'project': project,
+        'evaluation': evaluation,
+        'latest_job': latest_job,
+        'evaluator_status': evaluator_status,
+    }
+
+
+@login_required
+def ai_evaluation_status(request, project_id):
+    """JSON status of the latest AI job, with the re-rendered AI card"""
+    if request.user.user_type != 'faculty':
+        return JsonResponse({'error': 'Access denied.'}, status=403)
+
+    faculty = request.user.faculty_profile
+    project = get_object_or_404(Project, id=project_id, team__faculty=faculty)
+    evaluation = ProjectEvaluation.objects.filter(project=project).first()
+    context = ai_card_context(project, evaluation)
+    job = context['latest_job']
+
+    return JsonResponse({
+        'status': job.status if job else None,
+        'active': bool(job and job.is_active),
+        'error': (job.error_message or '') if job else '',
+        'ai_marks': evaluation.ai_marks if evaluation else None,
+        'html': render_to_string('evaluations/ai_evaluation_card.html', context, request=request),
+    })
+
+
 @login_required
 def ai_evaluate_project(request, project_id):
-    """AI evaluation using Gemini"""
+    """Queue an AI evaluation of a project"""
     if request.user.user_type != 'faculty':
         messages.error(request, 'Access denied.')
         return redirect('dashboard')
@@ -159,129 +212,59 @@ def ai_evaluate_project(request, project_id):
         messages.error(request, 'Please create evaluation criteria first.')
         return redirect('evaluate_project', project_id=project_id)
 
-    if not settings.GEMINI_API_KEY:
-        messages.error(request, 'Gemini API key not configured. Please add it to .env file.')
+    backend = get_backend()
+    if not backend.is_configured():
+        messages.error(request, backend.not_configured_message)
         return redirect('evaluate_project', project_id=project_id)
 
-    try:
-        # Extract PDF text
-        pdf_text = extract_pdf_text(project.project_report.path)
-
-        # Prepare evaluation prompt
-        criteria_text = "\n".join([
-            f"- {c.criteria_name} ({c.max_marks} marks): {c.criteria_description}"
-            for c in criteria_list
-        ])
-
-        total_marks = sum(c.max_marks for c in criteria_list)
-
-        prompt = f"""You are an expert project evaluator. Evaluate this project and provide a concise, well-formatted evaluation.
+    force_refresh = request.POST.get('force_refresh') == 'on'
+    job, created = enqueue_evaluation(project, faculty, force_refresh=force_refresh)
 
-PROJECT DETAILS:
-- Project Name: {project.project_name}
-- GitHub Link: {project.github_link}
-- Team: {project.team.team_name}
+    if created and get_breaker().seconds_until_retry():
+        messages.warning(request, 'The AI evaluator is currently unavailable. Your evaluation is queued and will run once it recovers.')
+    elif created:
+        messages.success(request, f'AI evaluation queued (job {job.id}). This page will update when it finishes.')
+    elif force_refresh and not job.force_refresh:
+        messages.warning(request, 'An AI evaluation for this project is already running and may use cached AI responses. Force re-evaluate again once it finishes.')
+    elif force_refresh:
+        messages.info(request, 'An AI evaluation for this project is already queued; it will now ignore cached AI responses.')
+    else:
+        messages.info(request, 'An AI evaluation for this project is already in progress.')
 
-PROJECT REPORT EXCERPT:
-{pdf_text[:2500]}
-
-EVALUATION CRITERIA:
-{criteria_text}
-Total Available: {total_marks} marks
-
-INSTRUCTIONS:
-1. Provide a total score out of {total_marks} marks
-2. Give brief, clear feedback for each criterion
-3. Keep your response concise and well-organized
-4. Use bullet points for clarity
-
-FORMAT YOUR RESPONSE EXACTLY LIKE THIS:
-
-SCORE: [Your score out of {total_marks}]
-
-EVALUATION SUMMARY:
-[2-3 sentences summarizing the overall project quality]
-
-DETAILED FEEDBACK:
-
-1. {list(criteria_list)[0].criteria_name if criteria_list else 'Criterion 1'}:
-   - [Brief evaluation point]
-   - [Brief evaluation point]
-
-2. {list(criteria_list)[1].criteria_name if len(criteria_list) > 1 else 'Criterion 2'}:
-   - [Brief evaluation point]
-   - [Brief evaluation point]
-
-[Continue for each criterion]
-
-STRENGTHS:
-- [Key strength]
-- [Key strength]
-
-AREAS FOR IMPROVEMENT:
-- [Improvement suggestion]
-- [Improvement suggestion]
-
-Keep each point concise (1 line). Total response should be clear and easy to read.
-"""
-
-        # Call Gemini AI
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        response = model.generate_content(prompt)
-        ai_response = response.text
-
-        # Parse score
-        marks = 0.0
+    return redirect('evaluate_project', project_id=project_id)
 
-        for line in ai_response.split('\n'):
-            if 'SCORE:' in line.upper():
-                numbers = re.findall(r'\d+\.?\d*', line)
-                if numbers:
-                    marks = float(numbers[0])
-                    # Normalize to 100
-                    marks = (marks / total_marks) * 100 if total_marks > 0 else 0.0
-                break
 
-        if marks == 0:
-            marks = 75.0  # fallback
+@login_required
+def ai_evaluate_all(request):
+    """Queue AI evaluations for all submitted projects"""
+    if request.user.user_type != 'faculty':
+        messages.error(request, 'Access denied.')
+        return redirect('dashboard')
 
-        formatted_feedback = format_ai_feedback(ai_response)
+    if request.method != 'POST':
+        return redirect('faculty_dashboard')
 
-        # Get or create evaluation
-        evaluation, created = ProjectEvaluation.objects.get_or_create(
-            project=project,
-            defaults={
-                'faculty': faculty,
-                'evaluation_criteria': json.dumps([{
-                    'name': c.criteria_name,
-                    'description': c.criteria_description,
-                    'max_marks': int(c.max_marks)
-                } for c in criteria_list])
-            }
-        )
+    faculty = request.user.faculty_profile
 
-        # Save as float - simple and clean
-        evaluation.ai_marks = round(min(marks, 100.0), 2)
-        evaluation.ai_feedback = formatted_feedback
-        evaluation.ai_evaluated_at = timezone.now()
-        evaluation.save()
+    if not EvaluationCriteria.objects.filter(faculty=faculty).exists():
+        messages.error(request, 'Please create evaluation criteria first.')
+        return redirect('faculty_dashboard')
 
-        # Update project status if fully evaluated
-        if evaluation.is_fully_evaluated:
-            project.status = 'evaluated'
-            project.save()
+    backend = get_backend()
+    if not backend.is_configured():
+        messages.error(request, backend.not_configured_message)
+        return redirect('faculty_dashboard')
 
-        messages.success(request, f'AI evaluation completed! Score: {evaluation.ai_marks}/100')
+    queued = enqueue_pending_evaluations(faculty)
 
-    except FileNotFoundError:
-        messages.error(request, 'Project report file not found. Please re-upload the report.')
-    except Exception as e:
-        messages.error(request, f'AI evaluation failed: {str(e)}')
-        print(f"AI Evaluation Error: {e}")
-        import traceback
-        traceback.print_exc()
+    if queued and get_breaker().seconds_until_retry():
+        messages.warning(request, f'Queued AI evaluation for {queued} submitted project(s). The AI evaluator is currently unavailable; they will run once it recovers.')
+    elif queued:
+        messages.success(request, f'Queued AI evaluation for {queued} submitted project(s).')
+    else:
+        messages.info(request, 'No submitted projects are waiting for AI evaluation.')
 
-    return redirect('evaluate_project', project_id=project_id)
+    return redirect('faculty_dashboard')
 
 
 @login_required
@@ -303,6 +286,16 @@ def faculty_evaluate_project(request, project_id):
     try:
         criteria_list = EvaluationCriteria.objects.filter(faculty=faculty)
 
+        # Optional per-criterion marks
+        faculty_scores = {}
+        for criterion in criteria_list:
+            value = request.POST.get(f'criterion_{criterion.id}', '').strip()
+            if value:
+                score = float(value)
+                if not 0 <= score <= criterion.max_marks:
+                    raise ValueError(f'{criterion.criteria_name} marks must be between 0 and {criterion.max_marks}')
+                faculty_scores[criterion.id] = score
+
         # Get or create evaluation
         evaluation, created = ProjectEvaluation.objects.get_or_create(
             project=project,
@@ -316,21 +309,26 @@ def faculty_evaluate_project(request, project_id):
             }
         )
 
+        invalidate_result_cache(evaluation)
+
         # Save as float - simple and clean
         evaluation.faculty_marks = float(faculty_marks)
         evaluation.faculty_feedback = faculty_feedback
         evaluation.faculty_evaluated_at = timezone.now()
-        evaluation.save()
+        evaluation.save(update_fields=['faculty_marks', 'faculty_feedback', 'faculty_evaluated_at', 'updated_at'])
+
+        save_criterion_scores(evaluation, criteria_list, faculty_scores=faculty_scores)
 
         # Update project status if fully evaluated
         if evaluation.is_fully_evaluated:
             project.status = 'evaluated'
             project.save()
+            notify_results_ready(evaluation)
 
         messages.success(request, 'Your evaluation has been saved successfully!')
 
     except ValueError:
-        messages.error(request, 'Please enter valid marks (0-100)')
+        messages.error(request, 'Please enter valid marks (0-100 overall, each criterion within its maximum)')
     except Exception as e:
         messages.error(request, f'Error saving evaluation: {str(e)}')
         print(f"Faculty Evaluation Error: {e}")
@@ -364,94 +362,46 @@ def evaluation_results(request, project_id):
     return render(request, 'evaluations/evaluation_results.html', context)
 
 
-# ============= HELPER FUNCTIONS =============
 
-def extract_pdf_text(pdf_path):
-    """Extract text from PDF file"""
-    try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
+# ============= ANALYTICS & EXPORT =============
 
-            # Extract first 5 pages (or all if less than 5)
-            num_pages = min(5, len(pdf_reader.pages))
+@login_required
+def faculty_analytics(request):
+    """Score distributions and AI vs faculty comparison across all of a faculty's projects"""
+    if request.user.user_type != 'faculty':
+        messages.error(request, 'Access denied.')
+        return redirect('dashboard')
 
-            for page_num in range(num_pages):
-                page = pdf_reader.pages[page_num]
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n\n"
+    faculty = request.user.faculty_profile
 
-            if not text.strip():
-                return "Unable to extract text from PDF. The file may be image-based or encrypted."
+    context = {
+        'faculty': faculty,
+        'analytics': analytics.faculty_analytics(faculty),
+    }
 
-            return text
+    return render(request, 'evaluations/analytics.html', context)
 
-    except FileNotFoundError:
-        return "Error: PDF file not found."
-    except Exception as e:
-        return f"Error extracting PDF: {str(e)}"
-
-
-def format_ai_feedback(feedback_text):
-    """Format AI feedback text to HTML with proper styling"""
-    # Remove SCORE: line if present
-    feedback_text = re.sub(r'SCORE:.*?\n', '', feedback_text, flags=re.IGNORECASE)
-
-    lines = feedback_text.split('\n')
-    formatted_html = []
-    in_list = False
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            if in_list:
-                formatted_html.append('</ul>')
-                in_list = False
-            continue
-
-        # Convert **text** to <strong>text</strong>
-        line = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', line)
-
-        # Convert *text* to <em>text</em>
-        line = re.sub(r'\*(.*?)\*', r'<em>\1</em>', line)
-
-        # Check if it's a heading (ALL CAPS or starts with #)
-        if line.isupper() and len(line) > 3 and ':' in line:
-            if in_list:
-                formatted_html.append('</ul>')
-                in_list = False
-            formatted_html.append(f'<h4>{line.replace(":", "")}</h4>')
-
-        # Check if it's a numbered item (1. , 2. , etc.)
-        elif re.match(r'^\d+\.', line):
-            if in_list:
-                formatted_html.append('</ul>')
-                in_list = False
-            # Extract criterion name and content
-            parts = line.split(':', 1)
-            if len(parts) == 2:
-                formatted_html.append(f'<div class="criteria-score"><strong>{parts[0]}:</strong> {parts[1]}</div>')
-            else:
-                formatted_html.append(f'<p><strong>{line}</strong></p>')
-
-        # Check if it's a bullet point (-, *, •)
-        elif line.startswith(('-', '•', '*')) or re.match(r'^\s*[-•*]', line):
-            if not in_list:
-                formatted_html.append('<ul>')
-                in_list = True
-            # Remove the bullet character
-            content = re.sub(r'^\s*[-•*]\s*', '', line)
-            formatted_html.append(f'<li>{content}</li>')
-
-        # Regular paragraph
-        else:
-            if in_list:
-                formatted_html.append('</ul>')
-                in_list = False
-            formatted_html.append(f'<p>{line}</p>')
-
-    if in_list:
-        formatted_html.append('</ul>')
-
-    return '\n'.join(formatted_html)
\ No newline at end of file
+
+@login_required
+def export_results(request):
+    """Stream marks of every team member as CSV, for the faculty's teams or their department"""
+    if request.user.user_type != 'faculty':
+        messages.error(request, 'Access denied.')
+        return redirect('dashboard')
+
+    faculty = request.user.faculty_profile
+
+    if request.GET.get('scope') == 'department':
+        # Marks of other faculty's teams are for staff (e.g. the exam cell) only
+        if not request.user.is_staff:
+            messages.error(request, 'Only staff can export results for the whole department.')
+            return redirect('faculty_analytics')
+        rows = export.result_rows(department=faculty.department)
+        filename = f'results_{faculty.department}_{timezone.now():%Y%m%d}.csv'
+    else:
+        rows = export.result_rows(faculty=faculty)
+        filename = f'results_{faculty.faculty_id}_{timezone.now():%Y%m%d}.csv'
+
+    response = StreamingHttpResponse(export.stream_csv(rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import OutboundEmail
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipients', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('subject', 'recipients')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'claimed_at', 'sent_at')
@@ -0,0 +1,24 @@
+from django.core.mail.backends.base import BaseEmailBackend
+from .models import OutboundEmail
+from .services import build_email
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Email backend that writes messages to the outbox instead of sending them
+
+    send_queued_emails later delivers them with EMAIL_OUTBOX_DELIVERY_BACKEND. Only the
+    subject, plain-text body, sender and recipients are kept; each Bcc address gets its
+    own email so recipients never see each other.
+    """
+
+    def send_messages(self, email_messages):
+        emails = []
+        for message in email_messages:
+            visible = list(message.to) + list(message.cc)
+            if visible:
+                emails.append(build_email(message.subject, message.body, visible, message.from_email))
+            for address in message.bcc:
+                emails.append(build_email(message.subject, message.body, [address], message.from_email))
+
+        OutboundEmail.objects.bulk_create(emails)
+        return len(email_messages)
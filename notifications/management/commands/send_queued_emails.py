@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notifications.services import requeue_stale_emails, send_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Deliver emails from the outbox, reusing one mail server connection per batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the outbox and exit instead of polling forever')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Emails sent per connection (default: EMAIL_OUTBOX_BATCH_SIZE)')
+        parser.add_argument('--poll-interval', type=float, default=5.0,
+                            help='Seconds to sleep when nothing is due')
+        parser.add_argument('--stale-after', type=int, default=600,
+                            help='Requeue emails stuck in sending for this many seconds')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Email sender started')
+
+        while True:
+            close_old_connections()
+
+            requeued = requeue_stale_emails(options['stale_after'])
+            if requeued:
+                self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale email(s)'))
+
+            claimed, sent = send_queued_emails(options['batch_size'])
+
+            if claimed:
+                style = self.style.SUCCESS if sent == claimed else self.style.WARNING
+                self.stdout.write(style(f'Sent {sent} of {claimed} email(s)'))
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
+
+        self.stdout.write('Email sender stopped')
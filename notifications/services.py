@@ -0,0 +1,119 @@
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from .models import OutboundEmail
+import json
+
+
+def build_email(subject, body, recipients, from_email=None):
+    """Unsaved outbox entry, for bulk_create"""
+    return OutboundEmail(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=json.dumps(list(recipients))
+    )
+
+
+def site_url(view_name):
+    """Absolute link to a named view for use in emails, based on SITE_URL"""
+    return settings.SITE_URL.rstrip('/') + reverse(view_name)
+
+
+def retry_delay(attempts):
+    """Exponential backoff: the base delay doubled for every failed attempt, capped"""
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY))
+
+
+def claim_emails(batch_size):
+    """Atomically move up to batch_size due emails from queued to sending"""
+    now = timezone.now()
+    due = OutboundEmail.objects.filter(status='queued').filter(
+        Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now)
+    ).order_by('created_at').values_list('id', flat=True)[:batch_size]
+
+    claimed = []
+    for email_id in list(due):
+        # Conditional update so two senders never deliver the same email
+        if OutboundEmail.objects.filter(id=email_id, status='queued').update(status='sending', claimed_at=now):
+            claimed.append(email_id)
+
+    return list(OutboundEmail.objects.filter(id__in=claimed).order_by('created_at'))
+
+
+def requeue_stale_emails(max_age_seconds):
+    """Put emails back in the queue whose sender died mid-batch"""
+    cutoff = timezone.now() - timedelta(seconds=max_age_seconds)
+    return OutboundEmail.objects.filter(status='sending', claimed_at__lt=cutoff).update(
+        status='queued',
+        claimed_at=None
+    )
+
+
+def record_failure(email, error):
+    """Schedule a retry with backoff, or give up after EMAIL_OUTBOX_MAX_ATTEMPTS"""
+    email.attempts += 1
+    email.last_error = f'{type(error).__name__}: {error}'
+    email.claimed_at = None
+
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = 'failed'
+        email.next_attempt_at = None
+    else:
+        email.status = 'queued'
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+
+    email.save()
+    print(f"Email {email.id} attempt {email.attempts} failed: {email.last_error}")
+
+
+def deliver_emails(emails):
+    """Send claimed emails over one mail server connection, returning how many were sent"""
+    if not emails:
+        return 0
+
+    connection = get_connection(settings.EMAIL_OUTBOX_DELIVERY_BACKEND)
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            record_failure(email, e)
+        return 0
+
+    sent = 0
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject,
+                email.body,
+                email.from_email,
+                email.recipient_list,
+                connection=connection
+            )
+            try:
+                # One message per call so a bad address only fails its own email
+                connection.send_messages([message])
+            except Exception as e:
+                record_failure(email, e)
+                continue
+
+            email.attempts += 1
+            email.status = 'sent'
+            email.sent_at = timezone.now()
+            email.last_error = None
+            email.save()
+            sent += 1
+    finally:
+        connection.close()
+
+    return sent
+
+
+def send_queued_emails(batch_size=None):
+    """Claim and deliver one batch from the outbox, returning (claimed, sent)"""
+    emails = claim_emails(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    return len(emails), deliver_emails(emails)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ProjectTeam, TeamMember, Project
+from .models import ProjectTeam, TeamMember, Project, ReportText
 
 @admin.register(ProjectTeam)
 class ProjectTeamAdmin(admin.ModelAdmin):
@@ -21,3 +21,10 @@ class ProjectAdmin(admin.ModelAdmin):
     list_filter = ('status', 'submitted_at')
     search_fields = ('project_name', 'team__team_name')
     ordering = ('-submitted_at',)
+
+@admin.register(ReportText)
+class ReportTextAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'created_at')
+    search_fields = ('sha256',)
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at',)
@@ -0,0 +1,30 @@
+from notifications.services import build_email, site_url
+
+
+def leader_credentials_email(team, student):
+    """Unsaved outbox email with a team leader's login credentials"""
+    subject = f'Project Leader Credentials - {team.team_name}'
+
+    login_url = site_url('leader_login')
+
+    message = f"""Dear {student.full_name},
+
+You have been assigned as the leader for the project team: {team.team_name}
+
+Your login credentials for project submission are:
+
+Username: {team.leader_username}
+Password: {team.leader_password}
+
+Please use these credentials to login and submit your project.
+
+Login URL: {login_url}
+
+Faculty: {team.faculty.full_name}
+Department: {team.faculty.department}
+
+Best regards,
+AI Project Evaluator System
+"""
+
+    return build_email(subject, message, [student.user.email])
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-17 02:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_report_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reporttext',
+            name='char_budget',
+            field=models.IntegerField(default=0, help_text='Character budget the text was extracted with'),
+        ),
+        migrations.AddField(
+            model_name='reporttext',
+            name='is_complete',
+            field=models.BooleanField(default=False, help_text='Whole document was extracted'),
+        ),
+    ]
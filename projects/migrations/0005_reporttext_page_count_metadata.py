@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-17 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_reporttext_char_budget'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reporttext',
+            name='metadata',
+            field=models.TextField(blank=True, default='{}', help_text='JSON string of PDF document info'),
+        ),
+        migrations.AddField(
+            model_name='reporttext',
+            name='page_count',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from accounts.models import Faculty, Student
 import uuid
+import hashlib
+import json
 import secrets
 import string
 
@@ -11,6 +13,14 @@ def generate_leader_credentials():
     return username, password
 
 
+def compute_file_sha256(file):
+    """SHA-256 hex digest of an uploaded or stored file"""
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
 class ProjectTeam(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     team_name = models.CharField(max_length=200)
@@ -57,10 +67,44 @@ class Project(models.Model):
     team = models.OneToOneField(ProjectTeam, on_delete=models.CASCADE, related_name='project')
     project_name = models.CharField(max_length=300)
     project_report = models.FileField(upload_to='project_reports/')
+    report_sha256 = models.CharField(max_length=64, blank=True, null=True, db_index=True)
     github_link = models.URLField(max_length=500)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     submitted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.project_name} - {self.team.team_name}"
\ No newline at end of file
+        return f"{self.project_name} - {self.team.team_name}"
+
+    def set_report(self, report_file):
+        """Attach a newly uploaded report and record its content hash"""
+        self.project_report = report_file
+        self.report_sha256 = compute_file_sha256(report_file)
+
+
+class ReportText(models.Model):
+    """Text and document info extracted from a report, shared by every upload with the same content"""
+    sha256 = models.CharField(max_length=64, unique=True)
+    text = models.TextField(blank=True)
+    char_budget = models.IntegerField(default=0, help_text='Character budget the text was extracted with')
+    is_complete = models.BooleanField(default=False, help_text='Whole document was extracted')
+    page_count = models.IntegerField(null=True, blank=True)
+    metadata = models.TextField(blank=True, default='{}', help_text='JSON string of PDF document info')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Report text {self.sha256[:12]}"
+
+    @property
+    def metadata_dict(self):
+        return json.loads(self.metadata or '{}')
+
+    def covers(self, char_budget):
+        """Whether this extraction has enough text for the given budget"""
+        return self.is_complete or self.char_budget >= char_budget
+
+    @classmethod
+    def discard(cls, sha256):
+        """Drop cached text once no project points at that report any more"""
+        if sha256 and not Project.objects.filter(report_sha256=sha256).exists():
+            cls.objects.filter(sha256=sha256).delete()
@@ -0,0 +1,121 @@
+from django.db import transaction
+from .models import ProjectTeam, TeamMember, generate_leader_credentials
+from .emails import leader_credentials_email
+from accounts.models import Student, FacultyStats
+from notifications.models import OutboundEmail
+import csv
+import io
+
+
+MAX_TEAM_MEMBERS = 4
+TRUE_VALUES = ('1', 'y', 'yes', 'true', 'leader')
+
+
+def read_team_csv(uploaded_file):
+    """Rows of a team CSV (columns: team_name, usn, is_leader) as dicts with line numbers"""
+    try:
+        text = uploaded_file.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return [], ['The file is not UTF-8 encoded CSV.']
+
+    reader = csv.DictReader(io.StringIO(text, newline=''))
+    if reader.fieldnames is None:
+        return [], ['The file is empty.']
+
+    columns = [name.strip().lower() for name in reader.fieldnames]
+    missing = [name for name in ('team_name', 'usn') if name not in columns]
+    if missing:
+        return [], [f'Missing column(s): {", ".join(missing)}. Expected team_name, usn, is_leader.']
+    reader.fieldnames = columns
+
+    rows = []
+    for line, row in enumerate(reader, start=2):
+        rows.append({
+            'line': line,
+            'team_name': (row.get('team_name') or '').strip(),
+            'usn': (row.get('usn') or '').strip().upper(),
+            'is_leader': (row.get('is_leader') or '').strip().lower() in TRUE_VALUES,
+        })
+    return rows, []
+
+
+def plan_team_import(rows, faculty):
+    """Validate CSV rows and group them into teams
+
+    Returns (teams, errors); each team is a dict with name, members [(student, is_leader)]
+    and leader. All USNs are resolved with one query.
+    """
+    errors = []
+    usns = {row['usn'] for row in rows if row['usn']}
+    students = {s.usn: s for s in Student.objects.filter(usn__in=usns).select_related('user')}
+    existing_names = set(
+        ProjectTeam.objects.filter(faculty=faculty, team_name__in={row['team_name'] for row in rows})
+        .values_list('team_name', flat=True)
+    )
+
+    teams = {}
+    seen_usns = {}
+    for row in rows:
+        line = row['line']
+        if not row['team_name'] or not row['usn']:
+            errors.append(f'Line {line}: team_name and usn are required.')
+            continue
+
+        if row['team_name'] in existing_names:
+            errors.append(f'Line {line}: you already have a team named "{row["team_name"]}".')
+            continue
+
+        student = students.get(row['usn'])
+        if student is None:
+            errors.append(f'Line {line}: student with USN {row["usn"]} not found.')
+            continue
+
+        if row['usn'] in seen_usns:
+            errors.append(f'Line {line}: USN {row["usn"]} is already listed on line {seen_usns[row["usn"]]}.')
+            continue
+        seen_usns[row['usn']] = line
+
+        team = teams.setdefault(row['team_name'], {'name': row['team_name'], 'members': [], 'leader': None})
+        if len(team['members']) >= MAX_TEAM_MEMBERS:
+            errors.append(f'Line {line}: team "{row["team_name"]}" already has {MAX_TEAM_MEMBERS} members.')
+            continue
+
+        if row['is_leader']:
+            if team['leader'] is not None:
+                errors.append(f'Line {line}: team "{row["team_name"]}" already has a leader.')
+                continue
+            team['leader'] = student
+
+        team['members'].append((student, row['is_leader']))
+
+    return list(teams.values()), errors
+
+
+@transaction.atomic
+def import_teams(teams, faculty):
+    """Create the planned teams and members with two bulk inserts"""
+    team_objects = []
+    members = []
+
+    for team in teams:
+        project_team = ProjectTeam(team_name=team['name'], faculty=faculty, leader=team['leader'])
+        if team['leader'] is not None:
+            # bulk_create skips ProjectTeam.save(), which normally generates these
+            project_team.leader_username, project_team.leader_password = generate_leader_credentials()
+        team_objects.append(project_team)
+
+        for student, is_leader in team['members']:
+            members.append(TeamMember(team=project_team, student=student, is_leader=is_leader))
+
+    ProjectTeam.objects.bulk_create(team_objects)
+    TeamMember.objects.bulk_create(members)
+
+    # Leader credentials go out through the outbox, committed with the teams
+    OutboundEmail.objects.bulk_create([
+        leader_credentials_email(team, team.leader) for team in team_objects if team.leader is not None
+    ])
+
+    # bulk_create sends no signals, so the dashboard counters are rebuilt once here
+    FacultyStats.rebuild(faculty.pk)
+
+    return team_objects
@@ -4,7 +4,9 @@ from . import views
 urlpatterns = [
     # Faculty - Team Management
     path('team/create/', views.create_team, name='create_team'),
+    path('team/import/', views.import_teams_csv, name='import_teams'),
     path('team/<uuid:team_id>/', views.team_detail, name='team_detail'),
+    path('team/<uuid:team_id>/students/', views.search_students, name='search_students'),
     path('team/<uuid:team_id>/add-member/', views.add_team_member, name='add_team_member'),
     path('team/<uuid:team_id>/set-leader/<int:student_id>/', views.set_team_leader, name='set_team_leader'),
     path('team/<uuid:team_id>/remove-member/<int:member_id>/', views.remove_team_member, name='remove_team_member'),
@@ -1,11 +1,14 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.mail import send_mail
-from django.conf import settings
 from django.db import transaction
-from .models import ProjectTeam, TeamMember, Project
+from django.db.models import Q
+from django.http import JsonResponse
+from .models import ProjectTeam, TeamMember, Project, ReportText
 from accounts.models import Student
+from evaluations.extraction import index_report
+from .team_import import read_team_csv, plan_team_import, import_teams
+from .emails import leader_credentials_email
 import json
 
 
@@ -35,6 +38,53 @@ def create_team(request):
     return render(request, 'projects/create_team.html')
 
 
+@login_required
+def import_teams_csv(request):
+    """Create many teams with members from an uploaded CSV, with a dry-run report"""
+    if request.user.user_type != 'faculty':
+        messages.error(request, 'Access denied. Faculty only.')
+        return redirect('dashboard')
+
+    faculty = request.user.faculty_profile
+    context = {}
+
+    if request.method == 'POST':
+        csv_file = request.FILES.get('csv_file')
+        dry_run = request.POST.get('dry_run') == 'on'
+
+        if not csv_file:
+            messages.error(request, 'Please choose a CSV file.')
+            return render(request, 'projects/import_teams.html', context)
+
+        rows, errors = read_team_csv(csv_file)
+        teams = []
+        if not errors:
+            teams, errors = plan_team_import(rows, faculty)
+
+        context = {
+            'teams': teams,
+            'errors': errors,
+            'dry_run': dry_run,
+            'member_total': sum(len(team['members']) for team in teams),
+        }
+
+        if errors:
+            messages.error(request, f'{len(errors)} problem(s) found. Nothing was imported.')
+        elif not teams:
+            messages.error(request, 'The file has no rows to import.')
+        elif dry_run:
+            messages.info(request, 'Dry run passed. Upload again without "Dry run" to import.')
+        else:
+            try:
+                import_teams(teams, faculty)
+                messages.success(request, f'Imported {len(teams)} team(s) with {context["member_total"]} member(s).')
+                return redirect('faculty_dashboard')
+            except Exception as e:
+                messages.error(request, f'Error importing teams: {str(e)}')
+
+    return render(request, 'projects/import_teams.html', context)
+
+
 @login_required
 def team_detail(request, team_id):
     """View and manage team details"""
@@ -46,10 +96,6 @@ def team_detail(request, team_id):
         team = get_object_or_404(ProjectTeam, id=team_id, faculty=request.user.faculty_profile)
         members = TeamMember.objects.filter(team=team).select_related('student')
 
-        # Get students not in this team for adding
-        existing_student_ids = [member.student.id for member in members]
-        available_students = Student.objects.exclude(id__in=existing_student_ids)
-
         # Check if project exists
         try:
             project = team.project
@@ -59,7 +105,6 @@ def team_detail(request, team_id):
         context = {
             'team': team,
             'members': members,
-            'available_students': available_students,
             'project': project,
         }
 
@@ -70,6 +115,38 @@ def team_detail(request, team_id):
         return redirect('faculty_dashboard')
 
 
+# The datalist shows this many matches; typing more of the USN or name narrows them down
+STUDENT_SEARCH_LIMIT = 20
+
+
+def prefix_filter(field, prefix):
+    """Prefix match written as a range, which any B-tree index can serve (LIKE/regex may not)"""
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + '\uffff'})
+
+
+@login_required
+def search_students(request, team_id):
+    """JSON list of students not in the team whose USN or name starts with q"""
+    if request.user.user_type != 'faculty':
+        return JsonResponse({'error': 'Access denied.'}, status=403)
+
+    team = get_object_or_404(ProjectTeam, id=team_id, faculty=request.user.faculty_profile)
+    query = request.GET.get('q', '').strip()
+
+    if not query:
+        return JsonResponse({'results': []})
+
+    # USNs are stored upper-case and search_name lower-case, so both prefix matches are
+    # plain range conditions that can use their indexes
+    students = Student.objects.filter(
+        prefix_filter('usn', query.upper()) | prefix_filter('search_name', query.lower())
+    ).exclude(
+        id__in=TeamMember.objects.filter(team=team).values('student_id')
+    ).order_by('usn').values('id', 'usn', 'full_name', 'department', 'semester')
+
+    return JsonResponse({'results': list(students[:STUDENT_SEARCH_LIMIT])})
+
+
 @login_required
 def add_team_member(request, team_id):
     """Add a student to team using USN"""
@@ -142,20 +219,12 @@ def set_team_leader(request, team_id, student_id):
             team.save()
             print(f"DEBUG: Team leader updated to {team.leader.full_name}")
 
-            # Send leader credentials email
-            try:
-                send_leader_credentials_email(team, member.student)
-                messages.success(
-                    request,
-                    f'{member.student.full_name} is now the team leader. Credentials sent to {member.student.user.email}'
-                )
-                print("DEBUG: Email sent successfully")
-            except Exception as email_error:
-                print(f"DEBUG: Email error: {email_error}")
-                messages.warning(
-                    request,
-                    f'{member.student.full_name} is now the team leader, but email sending failed: {email_error}'
-                )
+            # Queued in the same transaction; the outbox worker sends it
+            send_leader_credentials_email(team, member.student)
+            messages.success(
+                request,
+                f'{member.student.full_name} is now the team leader. Credentials will be emailed to {member.student.user.email}'
+            )
 
     except Exception as e:
         import traceback
@@ -197,57 +266,10 @@ def remove_team_member(request, team_id, member_id):
 
 
 def send_leader_credentials_email(team, student):
-    """Send login credentials to team leader"""
-    subject = f'Project Leader Credentials - {team.team_name}'
-
-    # Build the login URL
-    from django.contrib.sites.shortcuts import get_current_site
-    from django.conf import settings
-
-    # Use localhost for development
-    domain = 'localhost:8000' if settings.DEBUG else 'your-domain.com'
-    login_url = f"http://{domain}/projects/leader/login/"
-
-    message = f"""Dear {student.full_name},
-
-You have been assigned as the leader for the project team: {team.team_name}
-
-Your login credentials for project submission are:
-
-Username: {team.leader_username}
-Password: {team.leader_password}
-
-Please use these credentials to login and submit your project.
-
-Login URL: {login_url}
-
-Faculty: {team.faculty.full_name}
-Department: {team.faculty.department}
-
-Best regards,
-AI Project Evaluator System
-"""
-
-    try:
-        from django.core.mail import send_mail
-
-        print(f"DEBUG: Attempting to send email to {student.user.email}")
-        print(f"DEBUG: EMAIL_HOST_USER: {settings.EMAIL_HOST_USER}")
-        print(f"DEBUG: DEFAULT_FROM_EMAIL: {settings.DEFAULT_FROM_EMAIL}")
-
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [student.user.email],
-            fail_silently=False,
-        )
-        print(f"DEBUG: Email sent successfully")
-        return True
-    except Exception as e:
-        print(f"DEBUG: Email sending failed: {type(e).__name__}: {str(e)}")
-        # Don't raise the exception, just log it
-        return False
+    """Queue the login credentials email for a team leader"""
+    email = leader_credentials_email(team, student)
+    email.save()
+    return email
 
 
 # ============= LEADER - PROJECT SUBMISSION =============
@@ -338,11 +360,16 @@ def submit_project(request):
                 project.status = 'submitted'
 
             # Update report if provided
+            old_sha256 = project.report_sha256
             if project_report:
-                project.project_report = project_report
+                project.set_report(project_report)
 
             project.save()
 
+            if project.report_sha256 != old_sha256:
+                ReportText.discard(old_sha256)
+                index_uploaded_report(project)
+
             if created:
                 messages.success(request, 'Project submitted successfully!')
             else:
@@ -370,10 +397,15 @@ def edit_project(request, project_id):
         project.project_name = request.POST.get('project_name')
         project.github_link = request.POST.get('github_link')
 
+        old_sha256 = project.report_sha256
         if request.FILES.get('project_report'):
-            project.project_report = request.FILES.get('project_report')
+            project.set_report(request.FILES.get('project_report'))
 
         project.save()
+
+        if project.report_sha256 != old_sha256:
+            ReportText.discard(old_sha256)
+            index_uploaded_report(project)
         messages.success(request, 'Project updated successfully!')
         return redirect('leader_dashboard')
 
@@ -385,6 +417,15 @@ def edit_project(request, project_id):
     return render(request, 'projects/edit_project.html', context)
 
 
+def index_uploaded_report(project):
+    """Extract report text at upload so evaluation doesn't have to"""
+    try:
+        index_report(project)
+    except Exception as e:
+        # Evaluation falls back to extracting the report itself
+        print(f"Report indexing failed for {project.id}: {type(e).__name__}: {str(e)}")
+
+
 # ============= FACULTY - VIEW PROJECTS =============
 
 @login_required